@@ -6,13 +6,13 @@ Tests that a single node can start, generate blocks, and report correct state.
 
 import sys
 import tempfile
-import shutil
 from pathlib import Path
 
 # Add test framework to path
 sys.path.insert(0, str(Path(__file__).parent / "test_framework"))
 
 from test_node import TestNode
+from util import remove_test_dir, BINARY_PATH
 
 
 def main():
@@ -21,7 +21,7 @@ def main():
 
     # Setup test directory
     test_dir = Path(tempfile.mkdtemp(prefix="coinbasechain_test_"))
-    binary_path = Path(__file__).parent.parent.parent / "build" / "bin" / "coinbasechain"
+    binary_path = BINARY_PATH
 
     try:
         # Start a single node
@@ -70,7 +70,7 @@ def main():
             node.stop()
 
         print(f"Cleaning up test directory: {test_dir}")
-        shutil.rmtree(test_dir, ignore_errors=True)
+        remove_test_dir(test_dir)
 
     return 0
 
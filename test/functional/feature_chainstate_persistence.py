@@ -1,26 +1,52 @@
 #!/usr/bin/env python3
 # Chainstate persistence test - Verify node saves and restores all fork candidates
 
+import json
 import sys
 import time
 import tempfile
-import shutil
 from pathlib import Path
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 sys.path.insert(0, str(Path(__file__).parent / "test_framework"))
 from test_node import TestNode
+from util import (log, wait_until, wait_for_peers, copy_chain_fixtures,
+                  port_base, BINARY_PATH, TEST_DATA_DIR)
 
 GREEN = '\033[92m'
 RED = '\033[91m'
 YELLOW = '\033[93m'
 BLUE = '\033[94m'
-RESET = '\033[0m'
 
-def log(msg, color=None):
-    if color:
-        print(f"{color}{msg}{RESET}")
-    else:
-        print(msg)
+def read_headers_summary(headers_file):
+    """
+    Return (block_count, best_height) from a saved headers.json.
+
+    Streams the file with ijson when it is installed so that large chains are
+    never materialized in memory; falls back to json.load otherwise.
+    """
+    block_count = 0
+    best_height = -1
+
+    with open(headers_file, 'rb') as f:
+        if ijson is not None:
+            for prefix, event, value in ijson.parse(f):
+                if prefix == 'block_count':
+                    block_count = value
+                elif prefix == 'blocks.item.height':
+                    best_height = max(best_height, value)
+        else:
+            headers_data = json.load(f)
+            block_count = headers_data.get('block_count', 0)
+            for block in headers_data.get('blocks', []):
+                if 'height' in block:
+                    best_height = max(best_height, block['height'])
+
+    return block_count, best_height
 
 def main():
     """
@@ -35,15 +61,14 @@ def main():
     6. Verify Node0 converges to 20 blocks
     7. Restart Node0 again - verify it has 20 blocks
     """
-    BASE_PORT = 18444
-    test_data = Path(__file__).parent.parent / "data"
+    BASE_PORT = port_base()
 
-    if not test_data.exists():
+    if not TEST_DATA_DIR.exists():
         log("ERROR: Test data not found. Run generate_test_chains.py first!", RED)
         return 1
 
     test_dir = Path(tempfile.mkdtemp(prefix='cbc_persist_'))
-    binary_path = Path(__file__).parent.parent.parent / "build" / "bin" / "coinbasechain"
+    binary_path = BINARY_PATH
     nodes = []
 
     try:
@@ -55,10 +80,18 @@ def main():
         log("\nPHASE 1: Initial fork resolution with 3 chains", BLUE)
         log("-" * 70, BLUE)
 
+        # Copy all chain fixtures up front (Node3's is used in Phase 3)
+        node0_dir = test_dir / 'node0'
+        node1_dir = test_dir / 'node1'
+        node2_dir = test_dir / 'node2'
+        node3_dir = test_dir / 'node3'
+        copy_chain_fixtures([('chain_5', node0_dir),
+                             ('chain_10', node1_dir),
+                             ('chain_15', node2_dir),
+                             ('chain_20', node3_dir)])
+
         # Setup Node0 with 5-block chain
         log("Setting up Node0 with 5-block chain...", YELLOW)
-        node0_dir = test_dir / 'node0'
-        shutil.copytree(test_data / 'chain_5', node0_dir)
         node0 = TestNode(0, node0_dir, binary_path,
                         extra_args=["--listen", f"--port={BASE_PORT}"])
         nodes.append(node0)
@@ -69,8 +102,6 @@ def main():
 
         # Setup Node1 with 10-block chain
         log("Setting up Node1 with 10-block chain...", YELLOW)
-        node1_dir = test_dir / 'node1'
-        shutil.copytree(test_data / 'chain_10', node1_dir)
         node1 = TestNode(1, node1_dir, binary_path,
                         extra_args=["--listen", f"--port={BASE_PORT + 1}"])
         nodes.append(node1)
@@ -81,8 +112,6 @@ def main():
 
         # Setup Node2 with 15-block chain (longest for now)
         log("Setting up Node2 with 15-block chain...", YELLOW)
-        node2_dir = test_dir / 'node2'
-        shutil.copytree(test_data / 'chain_15', node2_dir)
         node2 = TestNode(2, node2_dir, binary_path,
                         extra_args=["--listen", f"--port={BASE_PORT + 2}"])
         nodes.append(node2)
@@ -96,10 +125,10 @@ def main():
         log("\nConnecting nodes to Node0...", YELLOW)
         node1.add_node(f"127.0.0.1:{BASE_PORT}", "add")
         node2.add_node(f"127.0.0.1:{BASE_PORT}", "add")
-        time.sleep(3)
 
         # Verify convergence to 15 blocks
         log("Verifying Node0 converged to 15 blocks...", YELLOW)
+        wait_until(lambda: node0.get_info()['bestblockhash'] == expected_hash_15, timeout=30)
         info = node0.get_info()
         if info['blocks'] != 15 or info['bestblockhash'] != expected_hash_15:
             log(f"✗ Node0 did not converge: height={info['blocks']}, expected 15", RED)
@@ -135,8 +164,6 @@ def main():
 
         # Setup Node3 with 20-block chain
         log("Setting up Node3 with 20-block chain...", YELLOW)
-        node3_dir = test_dir / 'node3'
-        shutil.copytree(test_data / 'chain_20', node3_dir)
         node3 = TestNode(3, node3_dir, binary_path,
                         extra_args=["--listen", f"--port={BASE_PORT + 3}"])
         nodes.append(node3)
@@ -149,7 +176,7 @@ def main():
         # Connect Node3 to Node0 FIRST (before reconnecting to shorter chains)
         log("\nConnecting Node3 to Node0...", YELLOW)
         node3.add_node(f"127.0.0.1:{BASE_PORT}", "add")
-        time.sleep(2)
+        wait_for_peers(node3, 1)
 
         # Now reconnect Node1 and Node2 to Node0
         # NOTE: We have Node1/Node2 connect TO Node0 (inbound to Node0) instead of
@@ -160,19 +187,23 @@ def main():
         log("Reconnecting Node1 and Node2 to Node0...", YELLOW)
         node1.add_node(f"127.0.0.1:{BASE_PORT}", "add")
         node2.add_node(f"127.0.0.1:{BASE_PORT}", "add")
-        time.sleep(2)
 
         # Verify Node0 re-orged to 20 blocks
         log("Verifying Node0 re-orged to 20 blocks...", YELLOW)
-        max_wait = 10
-        converged = False
-        for i in range(max_wait):
-            time.sleep(1)
+        last_height = None
+
+        def reorged_to_20():
+            nonlocal last_height
             info = node0.get_info()
             if info['blocks'] == 20 and info['bestblockhash'] == expected_hash_20:
-                converged = True
-                break
-            log(f"  Waiting... Node0 height={info['blocks']}/20", BLUE)
+                return True
+            if info['blocks'] != last_height:
+                log(f"  Waiting... Node0 height={info['blocks']}/20", BLUE)
+                last_height = info['blocks']
+            return False
+
+        converged = wait_until(reorged_to_20, timeout=15)
+        info = node0.get_info()
 
         if not converged:
             log(f"✗ Node0 did not re-org to 20 blocks: height={info['blocks']}", RED)
@@ -212,18 +243,7 @@ def main():
             log("✗ headers.json not found!", RED)
             return 1
 
-        import json
-        with open(headers_file, 'r') as f:
-            headers_data = json.load(f)
-
-        block_count = headers_data.get('block_count', 0)
-
-        # Find the best (highest) height from all blocks
-        best_height = -1
-        if 'blocks' in headers_data:
-            for block in headers_data['blocks']:
-                if 'height' in block:
-                    best_height = max(best_height, block['height'])
+        block_count, best_height = read_headers_summary(headers_file)
 
         log(f"✓ headers.json exists", GREEN)
         log(f"  Total blocks saved: {block_count}", BLUE)
@@ -4,33 +4,26 @@
 import sys
 import time
 import tempfile
-import shutil
 import threading
 import random
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent / "test_framework"))
 from test_node import TestNode
+from util import log, start_nodes, multi_get_info, port_base, BINARY_PATH
 
 GREEN = '\033[92m'
 RED = '\033[91m'
 YELLOW = '\033[93m'
 BLUE = '\033[94m'
-RESET = '\033[0m'
-
-def log(msg, color=None):
-    if color:
-        print(f"{color}{msg}{RESET}")
-    else:
-        print(msg)
 
 def main():
     # Configuration
     NUM_PEER_NODES = 20  # 20 random chains
-    BASE_PORT = 18444
+    BASE_PORT = port_base()
 
     test_dir = Path(tempfile.mkdtemp(prefix='cbc_chaos_'))
-    binary_path = Path(__file__).parent.parent.parent / "build" / "bin" / "coinbasechain"
+    binary_path = BINARY_PATH
     nodes = []
 
     try:
@@ -55,11 +48,7 @@ def main():
                           extra_args=["--listen", f"--port={BASE_PORT + i}"])
             nodes.append(node)
             peer_nodes.append(node)
-            node.start()
-            time.sleep(0.01)  # Very minimal delay
-
-            if i % 10 == 0:
-                log(f"  {i}/{NUM_PEER_NODES} nodes started...", BLUE)
+        start_nodes(peer_nodes)
 
         log(f"✓ All {NUM_PEER_NODES} peer nodes started\n", GREEN)
 
@@ -249,17 +238,15 @@ def main():
 
         # Sample some peers
         log("\nSampling peer states (first 10):", BLUE)
-        for i in range(1, min(11, NUM_PEER_NODES + 1)):
-            node = nodes[i]
-            if node.is_running():
-                try:
-                    info = node.get_info()
-                    height = info['blocks']
-                    bhash = info['bestblockhash']
-                    match = "✓" if bhash == expected_best_hash else "✗"
-                    log(f"  Node{i}: height={height}, converged={match}", BLUE)
-                except:
-                    log(f"  Node{i}: RPC failed", RED)
+        sample = [node for node in nodes[1:min(11, NUM_PEER_NODES + 1)] if node.is_running()]
+        for node, info in zip(sample, multi_get_info(sample, return_exceptions=True)):
+            if isinstance(info, Exception):
+                log(f"  Node{node.index}: RPC failed", RED)
+                continue
+            height = info['blocks']
+            bhash = info['bestblockhash']
+            match = "✓" if bhash == expected_best_hash else "✗"
+            log(f"  Node{node.index}: height={height}, converged={match}", BLUE)
 
         # ======================================================================
         # EXTENDED TEST: Continue mining to verify nodes stay in sync
@@ -314,28 +301,31 @@ def main():
         unsynced_count = 0
         crashed_count = 0
 
-        for i in range(1, NUM_PEER_NODES + 1):
-            node = nodes[i]
+        running = []
+        for node in nodes[1:NUM_PEER_NODES + 1]:
             if not node.is_running():
                 crashed_count += 1
-                log(f"  Node{i}: CRASHED ✗", RED)
+                log(f"  Node{node.index}: CRASHED ✗", RED)
+            else:
+                running.append(node)
+
+        for node, info in zip(running, multi_get_info(running, return_exceptions=True)):
+            i = node.index
+            if isinstance(info, Exception):
+                unsynced_count += 1
+                log(f"  Node{i}: RPC failed: {info} ✗", RED)
                 continue
 
-            try:
-                info = node.get_info()
-                height = info['blocks']
-                bhash = info['bestblockhash']
+            height = info['blocks']
+            bhash = info['bestblockhash']
 
-                if height == final_height and bhash == final_hash:
-                    synced_count += 1
-                    if i <= 10:  # Only log first 10
-                        log(f"  Node{i}: height={height}, synced=✓", GREEN)
-                else:
-                    unsynced_count += 1
-                    log(f"  Node{i}: height={height}, hash={bhash[:16]}... NOT SYNCED ✗", RED)
-            except Exception as e:
+            if height == final_height and bhash == final_hash:
+                synced_count += 1
+                if i <= 10:  # Only log first 10
+                    log(f"  Node{i}: height={height}, synced=✓", GREEN)
+            else:
                 unsynced_count += 1
-                log(f"  Node{i}: RPC failed: {e} ✗", RED)
+                log(f"  Node{i}: height={height}, hash={bhash[:16]}... NOT SYNCED ✗", RED)
 
         print()
         log(f"Sync results: {synced_count}/{NUM_PEER_NODES} peers synced",
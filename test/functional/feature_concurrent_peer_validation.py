@@ -21,7 +21,6 @@ from many peers, which is exactly when race conditions would appear.
 import sys
 import time
 import tempfile
-import shutil
 import threading
 from pathlib import Path
 
@@ -29,19 +28,13 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent / "test_framework"))
 
 from test_node import TestNode
+from util import log, start_nodes, multi_get_info, remove_test_dir, BINARY_PATH, port_base
 
 # Color codes for output
 GREEN = '\033[92m'
 RED = '\033[91m'
 YELLOW = '\033[93m'
 BLUE = '\033[94m'
-RESET = '\033[0m'
-
-def log(msg, color=None):
-    if color:
-        print(f"{color}{msg}{RESET}")
-    else:
-        print(msg)
 
 
 def main():
@@ -52,12 +45,12 @@ def main():
     NUM_PEER_NODES = 10  # 10 peers sending headers to Node0
     BLOCKS_PER_PEER = 20  # Each peer mines 20 blocks
     BLOCKS_WINNING_PEER = 50  # One peer mines 50 blocks (most work)
-    BASE_PORT = 18444
+    BASE_PORT = port_base()
 
     test_dir = Path(tempfile.mkdtemp(prefix='cbc_concurrent_'))
     log(f"Test directory: {test_dir}\n")
 
-    binary_path = Path(__file__).parent.parent.parent / "build" / "bin" / "coinbasechain"
+    binary_path = BINARY_PATH
     nodes = []
 
     try:
@@ -80,8 +73,7 @@ def main():
                           extra_args=["--listen", f"--port={BASE_PORT + i}"])
             nodes.append(node)
             peer_nodes.append(node)
-            node.start()
-            time.sleep(0.1)
+        start_nodes(peer_nodes)
 
         log(f"✓ All {NUM_PEER_NODES} peer nodes started\n", GREEN)
 
@@ -158,20 +150,21 @@ def main():
         log("Step 6: Checking chain state of all nodes...", BLUE)
 
         node_states = []
+        running = [node for node in nodes if node.is_running()]
+        infos = dict(zip(running, multi_get_info(running, return_exceptions=True)))
         for node in nodes:
-            if node.is_running():
-                try:
-                    info = node.get_info()
-                    node_states.append({
-                        'index': node.index,
-                        'height': info['blocks'],
-                        'tip': info['bestblockhash']
-                    })
-                    log(f"  Node{node.index}: height={info['blocks']}, tip={info['bestblockhash'][:16]}...")
-                except Exception as e:
-                    log(f"  Node{node.index}: Failed to get info: {e}", YELLOW)
-            else:
+            info = infos.get(node)
+            if info is None:
                 log(f"  Node{node.index}: Not running", RED)
+            elif isinstance(info, Exception):
+                log(f"  Node{node.index}: Failed to get info: {info}", YELLOW)
+            else:
+                node_states.append({
+                    'index': node.index,
+                    'height': info['blocks'],
+                    'tip': info['bestblockhash']
+                })
+                log(f"  Node{node.index}: height={info['blocks']}, tip={info['bestblockhash'][:16]}...")
 
         # Analyze the results
         log("\nChain consensus analysis:", BLUE)
@@ -251,13 +244,8 @@ def main():
             if node.is_running():
                 node.stop()
 
-        time.sleep(1)
-
-        try:
-            shutil.rmtree(test_dir)
-            log(f"Cleaned up test directory: {test_dir}\n")
-        except Exception as e:
-            log(f"Warning: Could not clean up {test_dir}: {e}", YELLOW)
+        remove_test_dir(test_dir)
+        log(f"Removing test directory: {test_dir}\n")
 
 if __name__ == '__main__':
     sys.exit(main())
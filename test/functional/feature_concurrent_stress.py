@@ -4,34 +4,27 @@
 import sys
 import time
 import tempfile
-import shutil
-import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent / "test_framework"))
 from test_node import TestNode
+from util import log, wait_until, map_nodes, multi_get_info, start_nodes, BINARY_PATH, port_base
 
 GREEN = '\033[92m'
 RED = '\033[91m'
 YELLOW = '\033[93m'
 BLUE = '\033[94m'
-RESET = '\033[0m'
-
-def log(msg, color=None):
-    if color:
-        print(f"{color}{msg}{RESET}")
-    else:
-        print(msg)
 
 def main():
     # More aggressive configuration
     NUM_PEER_NODES = 20  # 20 peers (double the original)
     BLOCKS_PER_PEER = 30
     BLOCKS_WINNING_PEER = 100  # Much longer chain
-    BASE_PORT = 18444
+    BASE_PORT = port_base()
 
     test_dir = Path(tempfile.mkdtemp(prefix='cbc_stress_'))
-    binary_path = Path(__file__).parent.parent.parent / "build" / "bin" / "coinbasechain"
+    binary_path = BINARY_PATH
     nodes = []
 
     try:
@@ -52,8 +45,7 @@ def main():
                           extra_args=["--listen", f"--port={BASE_PORT + i}"])
             nodes.append(node)
             peer_nodes.append(node)
-            node.start()
-            time.sleep(0.05)  # Very short delay
+        start_nodes(peer_nodes)
 
         log(f"All {NUM_PEER_NODES} peers started\n", GREEN)
 
@@ -62,61 +54,52 @@ def main():
 
         def mine_peer(node):
             num_blocks = BLOCKS_WINNING_PEER if node.index == 1 else BLOCKS_PER_PEER
-            try:
-                result = node.generate(num_blocks)
-                # generate() now returns {"blocks": N, "height": N}
-                blocks_mined = result.get('blocks', 0) if isinstance(result, dict) else 0
-                log(f"  Node{node.index}: {blocks_mined} blocks", BLUE)
-            except Exception as e:
-                log(f"  Node{node.index}: Mining failed: {e}", RED)
-
-        threads = []
-        for node in peer_nodes:
-            t = threading.Thread(target=mine_peer, args=(node,))
-            t.start()
-            threads.append(t)
-
-        for t in threads:
-            t.join()
+            result = node.generate(num_blocks)
+            # generate() now returns {"blocks": N, "height": N}
+            return result.get('blocks', 0) if isinstance(result, dict) else 0
+
+        with ThreadPoolExecutor(max_workers=NUM_PEER_NODES) as executor:
+            futures = {executor.submit(mine_peer, node): node for node in peer_nodes}
+            for future in as_completed(futures):
+                node = futures[future]
+                try:
+                    log(f"  Node{node.index}: {future.result()} blocks", BLUE)
+                except Exception as e:
+                    log(f"  Node{node.index}: Mining failed: {e}", RED)
 
         log("Mining complete\n", GREEN)
 
         # Connect all at once
         log(f"Connecting {NUM_PEER_NODES} peers to Node0 SIMULTANEOUSLY...", YELLOW)
 
-        def connect_peer(node):
-            try:
-                node.add_node(f"127.0.0.1:{BASE_PORT}", "add")
-            except Exception as e:
-                log(f"  Node{node.index}: Connection failed: {e}", RED)
-
-        connect_threads = []
-        for node in peer_nodes:
-            t = threading.Thread(target=connect_peer, args=(node,))
-            t.start()
-            connect_threads.append(t)
-
-        for t in connect_threads:
-            t.join()
+        results = map_nodes(lambda node: node.add_node(f"127.0.0.1:{BASE_PORT}", "add"),
+                            peer_nodes, return_exceptions=True)
+        for node, result in zip(peer_nodes, results):
+            if isinstance(result, Exception):
+                log(f"  Node{node.index}: Connection failed: {result}", RED)
 
         log("All peers connected\n", GREEN)
 
         # Monitor for convergence (max 30 seconds)
         log("Monitoring for convergence (max 30 seconds)...", BLUE)
         expected_height = BLOCKS_WINNING_PEER
-        converged = False
+        start_time = time.time()
+        reported_crashes = False
+        next_report = 5
 
-        for i in range(30):
-            time.sleep(1)
+        def node0_converged():
+            nonlocal reported_crashes, next_report
+            elapsed = time.time() - start_time
             if not node0.is_running():
-                log(f"\n✗ Node0 CRASHED after {i+1} seconds!", RED)
+                log(f"\n✗ Node0 CRASHED after {elapsed:.1f} seconds!", RED)
                 log("\nNode0 log (last 100 lines):", YELLOW)
                 log(node0.read_log(100))
                 raise RuntimeError("Node0 crashed!")
 
             # Check peer crashes too
             crashed_peers = [(n.index, n) for n in peer_nodes if not n.is_running()]
-            if crashed_peers and i == 1:  # Only log once
+            if crashed_peers and not reported_crashes:  # Only log once
+                reported_crashes = True
                 for idx, node in crashed_peers:
                     log(f"✗ Peer {idx} crashed! Last 30 log lines:", RED)
                     log(node.read_log(30))
@@ -124,16 +107,20 @@ def main():
 
             # Check if Node0 has converged to expected height
             try:
-                info = node0.get_info()
-                if info['blocks'] >= expected_height:
-                    log(f"  {i+1}s: Node0 converged to height {info['blocks']} ✓", GREEN)
-                    converged = True
-                    break
+                tip_height = node0.get_info()['blocks']
             except:
-                pass
+                tip_height = -1
+
+            if tip_height >= expected_height:
+                log(f"  {elapsed:.1f}s: Node0 converged to height {tip_height} ✓", GREEN)
+                return True
+
+            if elapsed >= next_report:
+                log(f"  {next_report}/30 seconds - Node0 running ✓")
+                next_report += 5
+            return False
 
-            if (i + 1) % 5 == 0:
-                log(f"  {i+1}/30 seconds - Node0 running ✓")
+        converged = wait_until(node0_converged, timeout=30)
 
         if converged:
             log(f"\n✓ Test passed - Node0 converged successfully!", GREEN)
@@ -142,13 +129,12 @@ def main():
 
         # Check final state
         log("\nFinal chain state:", BLUE)
-        for node in nodes[:5]:  # Just check first 5
-            if node.is_running():
-                try:
-                    info = node.get_info()
-                    log(f"  Node{node.index}: height={info['blocks']}")
-                except:
-                    log(f"  Node{node.index}: RPC failed")
+        running = [node for node in nodes[:5] if node.is_running()]  # Just check first 5
+        for node, info in zip(running, multi_get_info(running, return_exceptions=True)):
+            if isinstance(info, Exception):
+                log(f"  Node{node.index}: RPC failed")
+            else:
+                log(f"  Node{node.index}: height={info['blocks']}")
 
         return 0
 
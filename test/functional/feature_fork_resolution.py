@@ -4,36 +4,29 @@
 import sys
 import time
 import tempfile
-import shutil
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent / "test_framework"))
 from test_node import TestNode
+from util import (log, wait_until, wait_for_peers, multi_get_info, copy_chain_fixtures,
+                  port_base, BINARY_PATH, TEST_DATA_DIR)
 
 GREEN = '\033[92m'
 RED = '\033[91m'
 YELLOW = '\033[93m'
 BLUE = '\033[94m'
-RESET = '\033[0m'
-
-def log(msg, color=None):
-    if color:
-        print(f"{color}{msg}{RESET}")
-    else:
-        print(msg)
 
 def main():
     # Configuration
-    BASE_PORT = 18444
-    test_data = Path(__file__).parent.parent / "data"
+    BASE_PORT = port_base()
 
     # Check test data exists
-    if not test_data.exists():
+    if not TEST_DATA_DIR.exists():
         log("ERROR: Test data not found. Run generate_test_chains.py first!", RED)
         return 1
 
     test_dir = Path(tempfile.mkdtemp(prefix='cbc_fork_'))
-    binary_path = Path(__file__).parent.parent.parent / "build" / "bin" / "coinbasechain"
+    binary_path = BINARY_PATH
     nodes = []
 
     try:
@@ -46,10 +39,16 @@ def main():
         log("  - Node2: 15 blocks (longest)", YELLOW)
         log("Expected: All nodes converge to 15 blocks\n", YELLOW)
 
+        # Copy all chain fixtures up front
+        node0_dir = test_dir / 'node0'
+        node1_dir = test_dir / 'node1'
+        node2_dir = test_dir / 'node2'
+        copy_chain_fixtures([('chain_5', node0_dir),
+                             ('chain_10', node1_dir),
+                             ('chain_15', node2_dir)])
+
         # Create Node0 with 5-block chain
         log("Setting up Node0 with 5-block chain...", BLUE)
-        node0_dir = test_dir / 'node0'
-        shutil.copytree(test_data / 'chain_5', node0_dir)
         node0 = TestNode(0, node0_dir, binary_path,
                         extra_args=["--listen", f"--port={BASE_PORT}"])
         nodes.append(node0)
@@ -60,8 +59,6 @@ def main():
 
         # Create Node1 with 10-block chain
         log("Setting up Node1 with 10-block chain...", BLUE)
-        node1_dir = test_dir / 'node1'
-        shutil.copytree(test_data / 'chain_10', node1_dir)
         node1 = TestNode(1, node1_dir, binary_path,
                         extra_args=["--listen", f"--port={BASE_PORT + 1}"])
         nodes.append(node1)
@@ -72,8 +69,6 @@ def main():
 
         # Create Node2 with 15-block chain (longest)
         log("Setting up Node2 with 15-block chain (longest)...", BLUE)
-        node2_dir = test_dir / 'node2'
-        shutil.copytree(test_data / 'chain_15', node2_dir)
         node2 = TestNode(2, node2_dir, binary_path,
                         extra_args=["--listen", f"--port={BASE_PORT + 2}"])
         nodes.append(node2)
@@ -87,55 +82,58 @@ def main():
         # Connect Node1 to Node0
         log("Connecting Node1 → Node0...", BLUE)
         node1.add_node(f"127.0.0.1:{BASE_PORT}", "add")
-        time.sleep(1)
 
         # Connect Node2 to Node0 and Node1
         log("Connecting Node2 → Node0...", BLUE)
         node2.add_node(f"127.0.0.1:{BASE_PORT}", "add")
-        time.sleep(1)
 
         log("Connecting Node2 → Node1...", BLUE)
         node2.add_node(f"127.0.0.1:{BASE_PORT + 1}", "add")
-        time.sleep(1)
 
-        log("✓ All nodes connected\n", GREEN)
+        # Node0 is the hub: wait until both Node1 and Node2 are attached
+        if wait_for_peers(node0, 2):
+            log("✓ All nodes connected\n", GREEN)
+        else:
+            log("⚠ Node0 has fewer than 2 peers, continuing anyway\n", YELLOW)
 
         # Monitor convergence
         log("Monitoring convergence (max 60 seconds)...", BLUE)
-        max_wait = 60
-        check_interval = 2
         converged = [False, False, False]
+        last_heights = [None, None, None]
+        start_time = time.time()
 
-        for elapsed in range(0, max_wait, check_interval):
-            time.sleep(check_interval)
+        def all_converged():
+            elapsed = time.time() - start_time
 
             # Check each node
-            for i, node in enumerate(nodes):
-                if converged[i]:
-                    continue
-
-                if not node.is_running():
+            pending = [i for i in range(len(nodes)) if not converged[i]]
+            for i in pending:
+                if not nodes[i].is_running():
                     log(f"\n✗ CRASH: Node{i} crashed!", RED)
                     raise RuntimeError(f"Node{i} crashed!")
 
-                try:
-                    info = node.get_info()
-                    height = info['blocks']
-                    bhash = info['bestblockhash']
+            infos = multi_get_info([nodes[i] for i in pending], return_exceptions=True)
+            for i, info in zip(pending, infos):
+                if isinstance(info, Exception):
+                    log(f"  Node{i}: RPC error: {info}", RED)
+                    continue
+
+                height = info['blocks']
+                bhash = info['bestblockhash']
 
-                    if height == 15 and bhash == expected_hash:
-                        converged[i] = True
-                        log(f"  {elapsed+check_interval}s: Node{i} converged to height 15 ✓", GREEN)
-                    else:
-                        log(f"  {elapsed+check_interval}s: Node{i} height={height}/15", BLUE)
+                if height == 15 and bhash == expected_hash:
+                    converged[i] = True
+                    log(f"  {elapsed:.1f}s: Node{i} converged to height 15 ✓", GREEN)
+                elif height != last_heights[i]:
+                    log(f"  {elapsed:.1f}s: Node{i} height={height}/15", BLUE)
+                last_heights[i] = height
 
-                except Exception as e:
-                    log(f"  Node{i}: RPC error: {e}", RED)
+            return all(converged)
 
-            # Check if all converged
-            if all(converged):
-                log(f"\n✓ All nodes converged in {elapsed+check_interval} seconds!", GREEN)
-                break
+        # Poll quickly while convergence is likely, backing off towards 1s
+        if wait_until(all_converged, timeout=60, initial_interval=0.05,
+                      backoff=1.5, check_interval=1.0):
+            log(f"\n✓ All nodes converged in {time.time() - start_time:.1f} seconds!", GREEN)
 
         print()
 
@@ -144,8 +142,7 @@ def main():
         log("-" * 70, BLUE)
 
         all_synced = True
-        for i, node in enumerate(nodes):
-            info = node.get_info()
+        for i, info in enumerate(multi_get_info(nodes)):
             height = info['blocks']
             bhash = info['bestblockhash']
             match = "✓" if (height == 15 and bhash == expected_hash) else "✗"
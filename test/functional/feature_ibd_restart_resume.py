@@ -11,18 +11,12 @@ from pathlib import Path
 # Add test framework to path
 sys.path.insert(0, str(Path(__file__).parent / "test_framework"))
 from test_node import TestNode
+from util import log, port_base
 
 GREEN = '\033[92m'
 RED = '\033[91m'
 YELLOW = '\033[93m'
 BLUE = '\033[94m'
-RESET = '\033[0m'
-
-def log(msg, color=None):
-    if color:
-        print(f"{color}{msg}{RESET}")
-    else:
-        print(msg)
 
 def wait_for_height(node: TestNode, target: int, timeout: int = 30) -> bool:
     start = time.time()
@@ -39,7 +33,7 @@ def wait_for_height(node: TestNode, target: int, timeout: int = 30) -> bool:
 def main():
     log("\n=== IBD Resume After Restart Test ===\n", BLUE)
 
-    BASE_PORT = 18444
+    BASE_PORT = port_base()
     CHAIN_LEN = 120  # long enough to catch mid-sync, short enough to mine fast
 
     test_dir = Path(tempfile.mkdtemp(prefix='cbc_ibd_resume_'))
@@ -17,172 +17,88 @@ Scenario:
 
 import os
 import sys
-import time
-import subprocess
-import tempfile
-import shutil
-import signal
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_framework'))
+from test_node import TestNode
+from harness import make_test_dir, stop_and_cleanup
+from util import log, wait_until, map_nodes, start_nodes, port_base, BINARY_PATH
 
 # Color codes for output
 GREEN = '\033[92m'
 RED = '\033[91m'
 YELLOW = '\033[93m'
 BLUE = '\033[94m'
-RESET = '\033[0m'
-
-def log(msg, color=None):
-    if color:
-        print(f"{color}{msg}{RESET}")
-    else:
-        print(msg)
-
-class TestNode:
-    def __init__(self, node_id, datadir, port):
-        self.node_id = node_id
-        self.datadir = datadir
-        self.port = port
-        self.process = None
-
-    def start(self, extra_args=None, binary_path=None):
-        """Start the node"""
-        if binary_path is None:
-            import os
-            # Try to find binary relative to script
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            binary_path = os.path.join(script_dir, '../../build/bin/coinbasechain')
-
-        args = [
-            binary_path,
-            '--regtest',
-            f'--datadir={self.datadir}',
-            f'--port={self.port}',
-        ]
-
-        if extra_args:
-            args.extend(extra_args)
-
-        self.process = subprocess.Popen(
-            args,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
-
-        # Wait a bit for startup
-        time.sleep(0.5)
-
-        # Check if process is still running
-        if self.process.poll() is not None:
-            stdout, stderr = self.process.communicate()
-            raise RuntimeError(f"Node{self.node_id} failed to start:\nSTDOUT: {stdout}\nSTDERR: {stderr}")
-
-        log(f"Node{self.node_id} started (port={self.port})", GREEN)
-
-    def stop(self):
-        """Stop the node"""
-        if self.process:
-            self.process.send_signal(signal.SIGTERM)
-            try:
-                self.process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                self.process.kill()
-                self.process.wait()
-            log(f"Node{self.node_id} stopped", YELLOW)
-
-    def rpc(self, method, params=None):
-        """Call RPC method via coinbasechain-cli"""
-        import json
-
-        # Find coinbasechain-cli binary
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        cli_binary = os.path.join(script_dir, '../../build/bin/coinbasechain-cli')
-
-        args = [
-            cli_binary,
-            f'--datadir={self.datadir}',
-            method
-        ]
-
-        if params:
-            args.extend(str(p) for p in params)
 
-        try:
-            result = subprocess.run(
-                args,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-
-            if result.returncode != 0:
-                raise RuntimeError(f"RPC {method} failed: {result.stderr}")
-
-            # Try to parse JSON response
-            try:
-                return json.loads(result.stdout)
-            except json.JSONDecodeError:
-                return result.stdout.strip()
+class SyncNode(TestNode):
+    """TestNode with the chain helpers this test drives"""
 
-        except Exception as e:
-            raise RuntimeError(f"RPC call failed: {e}")
+    def __init__(self, index, datadir, port):
+        super().__init__(index, datadir, BINARY_PATH, extra_args=[f'--port={port}'])
+        self.port = port
 
     def getblockcount(self):
         """Get current block height"""
         try:
-            info = self.rpc('getinfo')
-            return info.get('blocks', 0) if isinstance(info, dict) else 0
+            count = self.rpc('getblockcount')
+            return count if isinstance(count, int) else 0
         except:
             return 0
 
     def mine_blocks(self, n):
         """Mine n blocks"""
+        # Generate all blocks at once
+        height = None
         try:
-            # Generate all blocks at once
-            address = "0000000000000000000000000000000000000000"
-            self.rpc('generate', [n, address])
+            result = self.generate(n)
         except Exception as e:
             log(f"Warning: Mining {n} blocks failed: {e}", YELLOW)
-            time.sleep(0.1)
-
-        # Verify we mined them
-        height = self.getblockcount()
-        log(f"Node{self.node_id} mined {n} blocks, now at height {height}", BLUE)
+        else:
+            # The node reports failures in-band, e.g. an out-of-range count
+            if isinstance(result, dict) and 'error' in result:
+                log(f"Warning: Mining {n} blocks failed: {result['error']}", YELLOW)
+            elif isinstance(result, dict):
+                height = result.get('height')
+
+        # generate reports the new tip height; only ask again if it failed
+        if height is None:
+            height = self.getblockcount()
+        log(f"Node{self.index} mined {n} blocks, now at height {height}", BLUE)
         return height
 
     def connect_to_peer(self, peer_addr):
         """Connect to a peer node"""
         try:
-            return self.rpc('addnode', [peer_addr, 'add'])
+            return self.add_node(peer_addr, 'add')
         except Exception as e:
             log(f"Warning: Connection to {peer_addr} failed: {e}", YELLOW)
             return None
 
 def wait_for_sync(nodes, target_height, timeout=30):
     """Wait for all nodes to sync to target height"""
-    start = time.time()
-
-    while time.time() - start < timeout:
-        heights = []
-        all_synced = True
-
-        for node in nodes:
-            try:
-                height = node.getblockcount()
-                heights.append(height)
-                if height < target_height:
-                    all_synced = False
-            except:
-                heights.append(0)
-                all_synced = False
-
-        if all_synced:
-            log(f"✓ All nodes synced to height {target_height}", GREEN)
-            return True
-
-        # Print progress
-        synced = sum(1 for h in heights if h >= target_height)
-        log(f"  Sync progress: {synced}/{len(nodes)} nodes at height {target_height} (heights: {heights})")
-        time.sleep(1)
+    heights = [0] * len(nodes)
+    done = [False] * len(nodes)
+    synced_count = 0
+
+    def all_synced():
+        nonlocal synced_count
+        before = synced_count
+        pending = [i for i in range(len(nodes)) if not done[i]]
+        polled = map_nodes(lambda node: node.getblockcount(),
+                           [nodes[i] for i in pending])
+        for i, height in zip(pending, polled):
+            heights[i] = height
+            if height >= target_height:
+                done[i] = True
+                synced_count += 1
+
+        if synced_count != before:
+            log(f"  Sync progress: {synced_count}/{len(nodes)} nodes at height {target_height} (heights: {heights})")
+        return synced_count == len(nodes)
+
+    if wait_until(all_synced, timeout=timeout, initial_interval=0.02,
+                  backoff=1.5, check_interval=0.5):
+        log(f"✓ All nodes synced to height {target_height}", GREEN)
+        return True
 
     log(f"✗ Sync timeout! Heights: {heights}", RED)
     return False
@@ -193,31 +109,23 @@ def main():
     # Configuration
     NUM_SYNC_NODES = 10  # 10 nodes syncing from Node0
     CHAIN_LENGTH = 50
-    BASE_PORT = 18444
+    BASE_PORT = port_base()
 
-    test_dir = tempfile.mkdtemp(prefix='cbc_multinode_')
+    test_dir = make_test_dir('cbc_multinode_')
     log(f"Test directory: {test_dir}\n")
 
     nodes = []
 
     try:
-        # Create Node0 (the node with the chain)
-        node0_dir = os.path.join(test_dir, 'node0')
-        os.makedirs(node0_dir)
-        node0 = TestNode(0, node0_dir, BASE_PORT)
-        nodes.append(node0)
-
-        # Create syncing nodes (Node1-10)
-        for i in range(1, NUM_SYNC_NODES + 1):
-            node_dir = os.path.join(test_dir, f'node{i}')
-            os.makedirs(node_dir)
-            node = TestNode(i, node_dir, BASE_PORT + i)
-            nodes.append(node)
+        # Node0 has the chain, Node1-10 sync from it. Datadirs are created
+        # by TestNode.start()
+        nodes = [SyncNode(i, test_dir / f'node{i}', BASE_PORT + i)
+                 for i in range(NUM_SYNC_NODES + 1)]
+        node0 = nodes[0]
 
         # Step 1: Start Node0 and mine chain
         log("Step 1: Starting Node0 and mining chain...", BLUE)
         node0.start()
-        time.sleep(1)
 
         initial_height = node0.getblockcount()
         log(f"✓ Node0 initial height: {initial_height}")
@@ -234,17 +142,13 @@ def main():
         log(f"Step 2: Starting {NUM_SYNC_NODES} nodes to sync from Node0...", BLUE)
         log("This tests concurrent header processing from multiple network threads\n")
 
-        for node in nodes[1:]:
-            node.start()
-            time.sleep(0.5)  # Wait for node to be ready
+        start_nodes(nodes[1:])
 
         log(f"✓ All {NUM_SYNC_NODES} sync nodes started\n", GREEN)
 
         # Now connect all nodes to Node0 via RPC
         log("Connecting all sync nodes to Node0 via RPC...", BLUE)
-        for node in nodes[1:]:
-            node.connect_to_peer(f'127.0.0.1:{BASE_PORT}')
-            time.sleep(0.1)
+        map_nodes(lambda node: node.connect_to_peer(f'127.0.0.1:{BASE_PORT}'), nodes[1:])
 
         log(f"✓ All nodes connected to Node0\n", GREEN)
 
@@ -258,7 +162,7 @@ def main():
         # Step 4: Verify all nodes have same tip
         log("\nStep 4: Verifying all nodes have consistent state...", BLUE)
 
-        heights = [node.getblockcount() for node in nodes]
+        heights = map_nodes(lambda node: node.getblockcount(), nodes)
         log(f"Final heights: {heights}")
 
         if not all(h == CHAIN_LENGTH for h in heights):
@@ -300,16 +204,7 @@ def main():
     finally:
         # Cleanup
         log("\nCleaning up...", YELLOW)
-        for node in nodes:
-            node.stop()
-
-        time.sleep(1)
-
-        try:
-            shutil.rmtree(test_dir)
-            log(f"Cleaned up test directory: {test_dir}\n")
-        except Exception as e:
-            log(f"Warning: Could not clean up {test_dir}: {e}", YELLOW)
+        stop_and_cleanup(nodes, test_dir)
 
 if __name__ == '__main__':
     sys.exit(main())
@@ -6,15 +6,14 @@ their configured suspicious reorg depth threshold.
 """
 
 import sys
-import tempfile
-import shutil
 import time
 from pathlib import Path
 
 # Add test framework to path
 sys.path.insert(0, str(Path(__file__).parent / "test_framework"))
 
-from test_node import TestNode
+from harness import make_test_dir, setup_nodes, print_logs, stop_and_cleanup
+from util import wait_until, port_base
 
 
 def main():
@@ -22,24 +21,19 @@ def main():
     print("\n=== Suspicious Reorg Detection Test ===\n")
 
     # Setup test directory
-    test_dir = Path(tempfile.mkdtemp(prefix="cbc_susp_"))
-    binary_path = Path(__file__).parent.parent.parent / "build" / "bin" / "coinbasechain"
-
-    node0 = None
-    node1 = None
+    test_dir = make_test_dir("cbc_susp_")
+    BASE_PORT = port_base(19000)
+    nodes = []
 
     try:
         # Test 1: Reorg within threshold should be accepted
         print("=== Test 1: Reorg within threshold ===\n")
 
-        node0 = TestNode(0, test_dir / "test1_node0", binary_path,
-                        extra_args=["--listen", "--port=19000", "--suspiciousreorgdepth=20"])
-        node1 = TestNode(1, test_dir / "test1_node1", binary_path,
-                        extra_args=["--listen", "--port=19001", "--suspiciousreorgdepth=20"])
-
-        node0.start()
-        node1.start()
-        time.sleep(1)
+        nodes = setup_nodes(test_dir, [
+            ["--listen", f"--port={BASE_PORT}", "--suspiciousreorgdepth=20"],
+            ["--listen", f"--port={BASE_PORT + 1}", "--suspiciousreorgdepth=20"],
+        ], prefix="test1_node")
+        node0, node1 = nodes
 
         # Both start at genesis
         assert node0.get_info()['blocks'] == 0
@@ -49,7 +43,8 @@ def main():
         # Node0 mines 9 blocks (chain A) - ISOLATED
         print("Node0 mining 9 blocks...")
         node0.generate(9)
-        time.sleep(0.5)  # Let miner finish
+        assert wait_until(lambda: node0.get_info()['blocks'] >= 9, timeout=5), \
+            "Node0 did not reach height 9 after generate"
         info0 = node0.get_info()
         blocks0 = info0['blocks']
         print(f"✓ Node0 at height {blocks0}")
@@ -57,7 +52,8 @@ def main():
         # Node1 mines 20 blocks (chain B - longer) - ISOLATED
         print("Node1 mining 20 blocks...")
         node1.generate(20)
-        time.sleep(0.5)  # Let miner finish
+        assert wait_until(lambda: node1.get_info()['blocks'] >= 20, timeout=5), \
+            "Node1 did not reach height 20 after generate"
         info1 = node1.get_info()
         blocks1 = info1['blocks']
         print(f"✓ Node1 at height {blocks1}")
@@ -70,11 +66,12 @@ def main():
 
         # Connect - node0 should accept the reorg (within threshold)
         print(f"\nConnecting (node0 should accept {reorg_depth}-block reorg)...")
-        node0.add_node("127.0.0.1:19001", "add")
-        node1.add_node("127.0.0.1:19000", "add")
+        node0.add_node(f"127.0.0.1:{BASE_PORT + 1}", "add")
+        node1.add_node(f"127.0.0.1:{BASE_PORT}", "add")
 
         # Wait for sync
-        time.sleep(3)
+        wait_until(lambda: node0.get_info()['blocks'] >= blocks1, timeout=10,
+                   initial_interval=0.02, backoff=1.5, check_interval=0.5)
         info0 = node0.get_info()
 
         assert info0['blocks'] >= blocks1, f"Expected node0 to sync to at least {blocks1}, got {info0['blocks']}"
@@ -88,14 +85,11 @@ def main():
         # Test 2: Reorg exceeding threshold should trigger shutdown
         print("=== Test 2: Deep reorg triggers shutdown ===\n")
 
-        node0 = TestNode(0, test_dir / "test2_node0", binary_path,
-                        extra_args=["--listen", "--port=19000", "--suspiciousreorgdepth=10"])
-        node1 = TestNode(1, test_dir / "test2_node1", binary_path,
-                        extra_args=["--listen", "--port=19001", "--suspiciousreorgdepth=10"])
-
-        node0.start()
-        node1.start()
-        time.sleep(1)
+        nodes = setup_nodes(test_dir, [
+            ["--listen", f"--port={BASE_PORT}", "--suspiciousreorgdepth=10"],
+            ["--listen", f"--port={BASE_PORT + 1}", "--suspiciousreorgdepth=10"],
+        ], prefix="test2_node")
+        node0, node1 = nodes
 
         # Both start at genesis
         assert node0.get_info()['blocks'] == 0
@@ -105,7 +99,8 @@ def main():
         # Node0 mines 50 blocks - ISOLATED
         print("Node0 mining 50 blocks...")
         node0.generate(50)
-        time.sleep(1)  # Let miner finish
+        assert wait_until(lambda: node0.get_info()['blocks'] >= 50, timeout=5), \
+            "Node0 did not reach height 50 after generate"
         info0 = node0.get_info()
         blocks0 = info0['blocks']
         print(f"✓ Node0 at height {blocks0}")
@@ -113,7 +108,8 @@ def main():
         # Node1 mines 70 blocks - ISOLATED (more work)
         print("Node1 mining 70 blocks...")
         node1.generate(70)
-        time.sleep(1)  # Let miner finish
+        assert wait_until(lambda: node1.get_info()['blocks'] >= 70, timeout=5), \
+            "Node1 did not reach height 70 after generate"
         info1 = node1.get_info()
         blocks1 = info1['blocks']
         print(f"✓ Node1 at height {blocks1}")
@@ -125,12 +121,13 @@ def main():
 
         # Connect - node0 should refuse and shut down
         print(f"\nConnecting (node0 should refuse {reorg_depth}-block reorg and shut down)...")
-        node0.add_node("127.0.0.1:19001", "add")
-        node1.add_node("127.0.0.1:19000", "add")
+        node0.add_node(f"127.0.0.1:{BASE_PORT + 1}", "add")
+        node1.add_node(f"127.0.0.1:{BASE_PORT}", "add")
 
         # Wait for headers to be exchanged and reorg detected
         # (need enough time for RandomX PoW validation of all headers)
-        time.sleep(5)
+        wait_until(lambda: "Shutting down" in node0.read_log(), timeout=15,
+                   initial_interval=0.02, backoff=1.5, check_interval=0.5)
 
         # Check logs for shutdown message
         log = node0.read_log()
@@ -148,23 +145,11 @@ def main():
         traceback.print_exc()
 
         # Print logs on failure
-        if node0:
-            print("\n--- Node0 last 50 lines ---")
-            print(node0.read_log(50))
-        if node1:
-            print("\n--- Node1 last 50 lines ---")
-            print(node1.read_log(50))
+        print_logs(nodes, 50)
         return 1
 
     finally:
-        # Cleanup
-        if node0 and node0.is_running():
-            node0.stop()
-        if node1 and node1.is_running():
-            node1.stop()
-
-        print(f"\nCleaning up test directory: {test_dir}")
-        shutil.rmtree(test_dir, ignore_errors=True)
+        stop_and_cleanup(nodes, test_dir)
 
 
 if __name__ == "__main__":
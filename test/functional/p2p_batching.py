@@ -20,6 +20,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent / "test_framework"))
 
 from test_node import TestNode
+from util import remove_test_dir, BINARY_PATH
 
 
 def main():
@@ -30,7 +31,7 @@ def main():
 
     # Setup test directory
     test_dir = Path(tempfile.mkdtemp(prefix="coinbasechain_test_"))
-    binary_path = Path(__file__).parent.parent.parent / "build" / "bin" / "coinbasechain"
+    binary_path = BINARY_PATH
 
     node0 = None
     node1 = None
@@ -197,7 +198,7 @@ def main():
             node1.stop()
 
         print(f"Cleaning up test directory: {test_dir}")
-        shutil.rmtree(test_dir, ignore_errors=True)
+        remove_test_dir(test_dir)
 
     return 0
 
@@ -5,16 +5,14 @@ Tests that two nodes can connect to each other and maintain the connection.
 """
 
 import sys
-import tempfile
-import shutil
 import time
 from pathlib import Path
 
 # Add test framework to path
 sys.path.insert(0, str(Path(__file__).parent / "test_framework"))
 
-from test_node import TestNode
-from util import wait_until, wait_for_peers
+from harness import make_test_dir, setup_nodes, print_logs, stop_and_cleanup
+from util import port_base
 
 
 def main():
@@ -22,24 +20,16 @@ def main():
     print("Starting p2p_connect test...")
 
     # Setup test directory
-    test_dir = Path(tempfile.mkdtemp(prefix="coinbasechain_test_"))
-    binary_path = Path(__file__).parent.parent.parent / "build" / "bin" / "coinbasechain"
-
-    node0 = None
-    node1 = None
+    test_dir = make_test_dir("coinbasechain_test_")
+    BASE_PORT = port_base(19000)
+    nodes = []
 
     try:
-        # Start node0 with listening enabled on port 19000
-        print("Starting node0 (listening on port 19000)...")
-        node0 = TestNode(0, test_dir / "node0", binary_path,
-                        extra_args=["--listen", "--port=19000"])
-        node0.start()
-
-        # Start node1 on port 19001 (not listening)
-        print("Starting node1 (port 19001)...")
-        node1 = TestNode(1, test_dir / "node1", binary_path,
-                        extra_args=["--port=19001"])
-        node1.start()
+        # node0 listens on BASE_PORT, node1 uses BASE_PORT + 1 (not listening)
+        print(f"Starting node0 (listening on port {BASE_PORT}) and node1 (port {BASE_PORT + 1})...")
+        nodes = setup_nodes(test_dir, [["--listen", f"--port={BASE_PORT}"],
+                                       [f"--port={BASE_PORT + 1}"]])
+        node0, node1 = nodes
 
         # Give nodes a moment to fully initialize
         time.sleep(1)
@@ -51,9 +41,9 @@ def main():
         print(f"Node1 initial state: {info1.get('connections', 0)} connections")
 
         # Connect node1 to node0
-        print("Connecting node1 to node0 at 127.0.0.1:19000...")
+        print(f"Connecting node1 to node0 at 127.0.0.1:{BASE_PORT}...")
         try:
-            result = node1.add_node("127.0.0.1:19000", "add")
+            result = node1.add_node(f"127.0.0.1:{BASE_PORT}", "add")
             print(f"Connection result: {result}")
         except Exception as e:
             print(f"Add node call returned: {e}")
@@ -103,25 +93,11 @@ def main():
         traceback.print_exc()
 
         # Print logs on failure
-        if node0:
-            print("\nNode0 last 30 lines of debug.log:")
-            print(node0.read_log(30))
-        if node1:
-            print("\nNode1 last 30 lines of debug.log:")
-            print(node1.read_log(30))
+        print_logs(nodes, 30)
         return 1
 
     finally:
-        # Cleanup
-        if node0 and node0.is_running():
-            print("Stopping node0...")
-            node0.stop()
-        if node1 and node1.is_running():
-            print("Stopping node1...")
-            node1.stop()
-
-        print(f"Cleaning up test directory: {test_dir}")
-        shutil.rmtree(test_dir, ignore_errors=True)
+        stop_and_cleanup(nodes, test_dir)
 
     return 0
 
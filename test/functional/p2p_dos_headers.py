@@ -11,15 +11,13 @@ This test verifies that:
 """
 
 import sys
-import tempfile
-import shutil
-import time
 from pathlib import Path
 
 # Add test framework to path
 sys.path.insert(0, str(Path(__file__).parent / "test_framework"))
 
-from test_node import TestNode
+from harness import make_test_dir, setup_nodes, print_logs, stop_and_cleanup
+from util import wait_until, port_base
 
 
 def main():
@@ -27,24 +25,22 @@ def main():
     print("Starting p2p_dos_headers test...")
 
     # Setup test directory
-    test_dir = Path(tempfile.mkdtemp(prefix="coinbasechain_test_dos_"))
-    binary_path = Path(__file__).parent.parent.parent / "build" / "bin" / "coinbasechain"
-
-    node0 = None
-    node1 = None
+    test_dir = make_test_dir("coinbasechain_test_dos_")
+    BASE_PORT = port_base(19000)
+    nodes = []
 
     try:
         # Start node0 (victim node - will receive bad headers)
         print("\n=== Setup: Starting nodes ===")
-        print("Starting node0 (listening on port 19000)...")
-        node0 = TestNode(0, test_dir / "node0", binary_path,
-                        extra_args=["--listen", "--port=19000"])
-        node0.start()
+        print(f"Starting node0 (listening on port {BASE_PORT})...")
+        nodes = setup_nodes(test_dir, [["--listen", f"--port={BASE_PORT}"]])
+        node0, = nodes
 
         # Generate a valid chain on node0
         print("Generating 10 blocks on node0 to establish chain...")
         node0.generate(10)
-        time.sleep(1)
+        assert wait_until(lambda: node0.get_info()['blocks'] >= 10, timeout=5), \
+            "Node0 did not reach height 10 after generate"
 
         info0 = node0.get_info()
         print(f"Node0 state: {info0['blocks']} blocks, tip: {info0['bestblockhash'][:16]}...")
@@ -64,18 +60,17 @@ def main():
         print("\n=== Test 1: Verify normal header sync works ===")
 
         # Start node1 and connect to node0
-        print("Starting node1 (port 19001)...")
-        node1 = TestNode(1, test_dir / "node1", binary_path,
-                        extra_args=["--port=19001"])
-        node1.start()
+        print(f"Starting node1 (port {BASE_PORT + 1})...")
+        node1, = setup_nodes(test_dir, [[f"--port={BASE_PORT + 1}"]], first_index=1)
+        nodes.append(node1)
 
         print("Connecting node1 to node0...")
-        result = node1.add_node("127.0.0.1:19000", "add")
+        result = node1.add_node(f"127.0.0.1:{BASE_PORT}", "add")
         print(f"Connection result: {result}")
 
         # Wait for sync
         print("Waiting for header sync...")
-        time.sleep(3)
+        wait_until(lambda: node1.get_info()['blocks'] >= info0['blocks'], timeout=10)
 
         info1 = node1.get_info()
         print(f"Node1 state: {info1['blocks']} blocks")
@@ -143,7 +138,7 @@ def main():
         # Generate more blocks on node0
         print("Generating 5 more blocks on node0...")
         node0.generate(5)
-        time.sleep(2)
+        wait_until(lambda: node1.get_info()['blocks'] >= 15, timeout=10)
 
         info0_final = node0.get_info()
         info1_final = node1.get_info()
@@ -190,25 +185,11 @@ def main():
         traceback.print_exc()
 
         # Print logs on failure
-        if node0:
-            print("\nNode0 last 50 lines of debug.log:")
-            print(node0.read_log(50))
-        if node1:
-            print("\nNode1 last 50 lines of debug.log:")
-            print(node1.read_log(50))
+        print_logs(nodes, 50)
         return 1
 
     finally:
-        # Cleanup
-        if node0 and node0.is_running():
-            print("\nStopping node0...")
-            node0.stop()
-        if node1 and node1.is_running():
-            print("Stopping node1...")
-            node1.stop()
-
-        print(f"Cleaning up test directory: {test_dir}")
-        shutil.rmtree(test_dir, ignore_errors=True)
+        stop_and_cleanup(nodes, test_dir)
 
     return 0
 
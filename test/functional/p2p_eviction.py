@@ -9,8 +9,6 @@ This test verifies that:
 """
 
 import sys
-import tempfile
-import shutil
 import time
 from pathlib import Path
 
@@ -18,6 +16,8 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent / "test_framework"))
 
 from test_node import TestNode
+from harness import make_test_dir, stop_and_cleanup
+from util import wait_until, wait_for_peers, port_base, BINARY_PATH
 
 
 def main():
@@ -25,39 +25,37 @@ def main():
     print("Starting p2p_eviction test (mocktime)...")
 
     # Setup test directory
-    test_dir = Path(tempfile.mkdtemp(prefix="coinbasechain_test_eviction_"))
-    binary_path = Path(__file__).parent.parent.parent / "build" / "bin" / "coinbasechain"
+    test_dir = make_test_dir("coinbasechain_test_eviction_")
+    binary_path = BINARY_PATH
+    BASE_PORT = port_base(19000)
 
     node0 = None
     node1 = None
 
     try:
-        # Start node0 with listening enabled on port 19000
-        print("Starting node0 (listening on port 19000)...")
+        # Start node0 with listening enabled on BASE_PORT
+        print(f"Starting node0 (listening on port {BASE_PORT})...")
         node0 = TestNode(0, test_dir / "node0", binary_path,
-                        extra_args=["--listen", "--port=19000"])
+                        extra_args=["--listen", f"--port={BASE_PORT}"])
         node0.start()
 
-        # Start node1 on port 19001 (not listening)
-        print("Starting node1 (port 19001)...")
+        # Start node1 on BASE_PORT + 1 (not listening)
+        print(f"Starting node1 (port {BASE_PORT + 1})...")
         node1 = TestNode(1, test_dir / "node1", binary_path,
-                        extra_args=["--port=19001"])
+                        extra_args=[f"--port={BASE_PORT + 1}"])
         node1.start()
 
-        # Give nodes a moment to fully initialize
-        time.sleep(1)
-
         # Connect node1 to node0
-        print("Connecting node1 to node0 at 127.0.0.1:19000...")
+        print(f"Connecting node1 to node0 at 127.0.0.1:{BASE_PORT}...")
         try:
-            result = node1.add_node("127.0.0.1:19000", "add")
+            result = node1.add_node(f"127.0.0.1:{BASE_PORT}", "add")
             print(f"Connection result: {result}")
         except Exception as e:
             print(f"Add node call: {e}")
 
         # Wait for connection to establish
         print("Waiting for connection to establish...")
-        time.sleep(2)
+        wait_for_peers(node1, 1)
 
         # Generate a few blocks to ensure connection is working
         print("Generating 3 blocks on node0...")
@@ -68,7 +66,7 @@ def main():
 
         # Wait for blocks to propagate
         print("Waiting for blocks to propagate...")
-        time.sleep(2)
+        wait_until(lambda: node1.get_info()['blocks'] >= 3, timeout=10)
 
         # Check node1 state
         info1 = node1.get_info()
@@ -113,7 +111,7 @@ def main():
         # Verify node still works after mocktime operations
         print("\nVerifying node still works after mocktime operations...")
         node0.generate(2)
-        time.sleep(2)
+        wait_until(lambda: node1.get_info()['blocks'] >= 5, timeout=10)
 
         info0_final = node0.get_info()
         info1_final = node1.get_info()
@@ -144,15 +142,7 @@ def main():
 
     finally:
         # Cleanup
-        if node0 and node0.is_running():
-            print("Stopping node0...")
-            node0.stop()
-        if node1 and node1.is_running():
-            print("Stopping node1...")
-            node1.stop()
-
-        print(f"Cleaning up test directory: {test_dir}")
-        shutil.rmtree(test_dir, ignore_errors=True)
+        stop_and_cleanup([node0, node1], test_dir)
 
     return 0
 
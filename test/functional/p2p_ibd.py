@@ -12,7 +12,6 @@ Scenario:
 
 import sys
 import tempfile
-import shutil
 import time
 from pathlib import Path
 
@@ -20,6 +19,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent / "test_framework"))
 
 from test_node import TestNode
+from util import remove_test_dir, BINARY_PATH
 
 
 def main():
@@ -28,7 +28,7 @@ def main():
 
     # Setup test directory
     test_dir = Path(tempfile.mkdtemp(prefix="coinbasechain_test_"))
-    binary_path = Path(__file__).parent.parent.parent / "build" / "bin" / "coinbasechain"
+    binary_path = BINARY_PATH
 
     node0 = None
     node1 = None
@@ -139,7 +139,7 @@ def main():
             node1.stop()
 
         print(f"Cleaning up test directory: {test_dir}")
-        shutil.rmtree(test_dir, ignore_errors=True)
+        remove_test_dir(test_dir)
 
     return 0
 
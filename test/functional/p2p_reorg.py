@@ -13,7 +13,6 @@ Test Scenarios:
 
 import sys
 import tempfile
-import shutil
 import time
 from pathlib import Path
 
@@ -21,6 +20,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent / "test_framework"))
 
 from test_node import TestNode
+from util import remove_test_dir, BINARY_PATH
 
 
 def main():
@@ -29,7 +29,7 @@ def main():
 
     # Setup test directory
     test_dir = Path(tempfile.mkdtemp(prefix="coinbasechain_reorg_"))
-    binary_path = Path(__file__).parent.parent.parent / "build" / "bin" / "coinbasechain"
+    binary_path = BINARY_PATH
 
     node0 = None
     node1 = None
@@ -77,7 +77,7 @@ def main():
             node1.stop()
 
         print(f"\nCleaning up test directory: {test_dir}")
-        shutil.rmtree(test_dir, ignore_errors=True)
+        remove_test_dir(test_dir)
 
 
 def test_simple_reorg(node0, node1):
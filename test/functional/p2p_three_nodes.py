@@ -8,15 +8,14 @@ This verifies that node1 can relay blocks it receives from node0 to node2.
 """
 
 import sys
-import tempfile
-import shutil
-import time
 from pathlib import Path
 
 # Add test framework to path
 sys.path.insert(0, str(Path(__file__).parent / "test_framework"))
 
 from test_node import TestNode
+from harness import make_test_dir, stop_and_cleanup
+from util import wait_until, wait_for_peers, multi_get_info, port_base, BINARY_PATH
 
 
 def main():
@@ -24,50 +23,47 @@ def main():
     print("Starting p2p_three_nodes test...")
 
     # Setup test directory
-    test_dir = Path(tempfile.mkdtemp(prefix="coinbasechain_test_"))
-    binary_path = Path(__file__).parent.parent.parent / "build" / "bin" / "coinbasechain"
+    test_dir = make_test_dir("coinbasechain_test_")
+    binary_path = BINARY_PATH
+    BASE_PORT = port_base(19000)
 
     node0 = None
     node1 = None
     node2 = None
 
     try:
-        # Start node0 (mining node) on port 19000
-        print("Starting node0 (port 19000)...")
+        # Start node0 (mining node) on BASE_PORT
+        print(f"Starting node0 (port {BASE_PORT})...")
         node0 = TestNode(0, test_dir / "node0", binary_path,
-                        extra_args=["--listen", "--port=19000"])
+                        extra_args=["--listen", f"--port={BASE_PORT}"])
         node0.start()
 
-        # Start node1 (relay node) on port 19001
-        print("Starting node1 (port 19001)...")
+        # Start node1 (relay node) on BASE_PORT + 1
+        print(f"Starting node1 (port {BASE_PORT + 1})...")
         node1 = TestNode(1, test_dir / "node1", binary_path,
-                        extra_args=["--listen", "--port=19001"])
+                        extra_args=["--listen", f"--port={BASE_PORT + 1}"])
         node1.start()
 
-        # Start node2 (receiving node) on port 19002 - must listen to receive relayed blocks
-        print("Starting node2 (port 19002)...")
+        # Start node2 (receiving node) on BASE_PORT + 2 - must listen to receive relayed blocks
+        print(f"Starting node2 (port {BASE_PORT + 2})...")
         node2 = TestNode(2, test_dir / "node2", binary_path,
-                        extra_args=["--listen", "--port=19002"])
+                        extra_args=["--listen", f"--port={BASE_PORT + 2}"])
         node2.start()
 
-        time.sleep(1)
-
         # Build network topology: node0 -> node1 -> node2
         print("\nBuilding network topology: node0 -> node1 -> node2")
 
         print("Connecting node0 to node1...")
-        node0.add_node("127.0.0.1:19001", "add")
+        node0.add_node(f"127.0.0.1:{BASE_PORT + 1}", "add")
 
         print("Connecting node1 to node2...")
-        node1.add_node("127.0.0.1:19002", "add")
+        node1.add_node(f"127.0.0.1:{BASE_PORT + 2}", "add")
 
-        # Wait for connections to establish
-        time.sleep(2)
+        # Wait for connections to establish (node1 has one peer each side)
+        wait_for_peers(node1, 2)
 
         # Verify all nodes start at genesis
-        info0 = node0.get_info()
-        info1 = node1.get_info()
-        info2 = node2.get_info()
+        info0, info1, info2 = multi_get_info([node0, node1, node2])
 
         print(f"\nInitial state:")
         print(f"  Node0: {info0['blocks']} blocks")
@@ -88,12 +84,16 @@ def main():
 
         # Wait for propagation through the chain
         print("Waiting for blocks to propagate through node0 -> node1 -> node2...")
-        time.sleep(4)
+
+        def all_synced():
+            infos = multi_get_info([node0, node1, node2])
+            return (all(info['blocks'] >= 10 for info in infos) and
+                    len({info['bestblockhash'] for info in infos}) == 1)
+
+        wait_until(all_synced, timeout=30)
 
         # Verify all nodes synced to height 10
-        info0 = node0.get_info()
-        info1 = node1.get_info()
-        info2 = node2.get_info()
+        info0, info1, info2 = multi_get_info([node0, node1, node2])
 
         print(f"\nFinal state:")
         print(f"  Node0: height={info0['blocks']}, tip={info0['bestblockhash'][:16]}...")
@@ -129,13 +129,7 @@ def main():
 
     finally:
         # Cleanup
-        for i, node in enumerate([node0, node1, node2]):
-            if node and node.is_running():
-                print(f"Stopping node{i}...")
-                node.stop()
-
-        print(f"Cleaning up test directory: {test_dir}")
-        shutil.rmtree(test_dir, ignore_errors=True)
+        stop_and_cleanup([node0, node1, node2], test_dir)
 
     return 0
 
@@ -3,7 +3,6 @@
 
 import sys
 import tempfile
-import shutil
 import time
 from pathlib import Path
 
@@ -11,6 +10,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent / "test_framework"))
 
 from test_node import TestNode
+from util import remove_test_dir, BINARY_PATH
 
 
 def listbanned_map(node):
@@ -23,7 +23,7 @@ def main():
     print("Starting rpc_setban test...")
 
     test_dir = Path(tempfile.mkdtemp(prefix="coinbasechain_rpc_setban_"))
-    binary_path = Path(__file__).parent.parent.parent / "build" / "bin" / "coinbasechain"
+    binary_path = BINARY_PATH
     node = None
 
     try:
@@ -93,7 +93,7 @@ def main():
             print("Stopping node...")
             node.stop()
         print(f"Cleaning up {test_dir}")
-        shutil.rmtree(test_dir, ignore_errors=True)
+        remove_test_dir(test_dir)
 
 
 if __name__ == "__main__":
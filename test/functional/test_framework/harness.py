@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Shared setup and teardown for functional tests."""
+
+import tempfile
+from pathlib import Path
+
+from test_node import TestNode
+from util import BINARY_PATH, map_nodes, remove_test_dir, scratch_root, stop_nodes
+
+
+def make_test_dir(prefix):
+    """
+    Create a fresh temporary directory for one test run.
+
+    The directory is created under scratch_root(): TMPDIR when set, else
+    /dev/shm when it has room, else the default temp directory.
+
+    Args:
+        prefix: Prefix for the directory name
+
+    Returns:
+        Path to the new directory
+    """
+    return Path(tempfile.mkdtemp(prefix=prefix, dir=scratch_root()))
+
+
+def setup_nodes(test_dir, extra_args_per_node, binary_path=BINARY_PATH,
+                prefix="node", first_index=0):
+    """
+    Create one TestNode per argument list and start them concurrently.
+
+    If any node fails to start, the ones that did start are stopped again
+    before the error is raised.
+
+    Args:
+        test_dir: Directory to create the node datadirs in
+        extra_args_per_node: List of extra argument lists, one per node
+        binary_path: Path to coinbasechain binary
+        prefix: Datadir name prefix; each node uses <prefix><index>
+        first_index: Index of the first node created
+
+    Returns:
+        List of started TestNode instances
+    """
+    nodes = [
+        TestNode(index, Path(test_dir) / f"{prefix}{index}", binary_path,
+                 extra_args=extra_args)
+        for index, extra_args in enumerate(extra_args_per_node, first_index)
+    ]
+    results = map_nodes(lambda node: node.start(), nodes, return_exceptions=True)
+    errors = [r for r in results if isinstance(r, Exception)]
+    if errors:
+        map_nodes(lambda node: node.stop(), nodes, return_exceptions=True)
+        raise errors[0]
+    return nodes
+
+
+def print_logs(nodes, lines=50):
+    """
+    Print the end of each node's debug.log, typically after a failure.
+
+    Args:
+        nodes: Iterable of TestNode instances (None entries are skipped)
+        lines: Number of lines to print per node
+    """
+    for node in nodes:
+        if node is None:
+            continue
+        print(f"\nNode{node.index} last {lines} lines of debug.log:")
+        print(node.read_log(lines))
+
+
+def stop_and_cleanup(nodes, test_dir):
+    """
+    Stop all nodes together and remove the test directory.
+
+    Args:
+        nodes: Iterable of TestNode instances (None entries are skipped)
+        test_dir: Test directory to remove
+    """
+    stop_nodes(nodes)
+    print(f"Cleaning up test directory: {test_dir}")
+    remove_test_dir(test_dir)
@@ -1,14 +1,158 @@
 #!/usr/bin/env python3
 """Test node management for functional tests."""
 
+import functools
 import os
+import socket
 import subprocess
 import time
-import tempfile
 import shutil
 import json
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+# catch the stdlib exception either way
+json_loads = orjson.loads if orjson is not None else json.loads
+# Both produce UTF-8 bytes ready to send
+if orjson is not None:
+    json_dumps = orjson.dumps
+else:
+    def json_dumps(obj):
+        return json.dumps(obj).encode()
+
+# Connect/send failures after which the server cannot have read the request:
+# a full accept backlog (EAGAIN) or a connection dropped before it was served
+RETRYABLE_RPC_ERRORS = (BlockingIOError, BrokenPipeError, ConnectionResetError)
+
+
+@functools.lru_cache(maxsize=None)
+def _bare_request(method):
+    """Encode a parameterless RPC request once; polling loops resend these."""
+    return json_dumps({"method": method}) + b"\n"
+
+
+def rpc_call(socket_path, method, *params, timeout=30):
+    """
+    Call an RPC method on a node's Unix socket.
+
+    Talks to the socket directly instead of spawning coinbasechain-cli for
+    every call. The server handles one request per connection and then
+    closes it, so each call opens a fresh connection; holding one open would
+    stall the serial server for every other client. A call that fails before
+    the request reaches the server is retried once.
+
+    Args:
+        socket_path: Path to the node's node.sock
+        method: RPC method name
+        *params: Parameters, sent as strings
+        timeout: Socket timeout in seconds
+
+    Returns:
+        Decoded JSON response
+    """
+    if params:
+        payload = json_dumps({"method": method,
+                              "params": [str(p) for p in params]}) + b"\n"
+    else:
+        payload = _bare_request(method)
+
+    for attempt in range(2):
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(timeout)
+                try:
+                    sock.connect(str(socket_path))
+                    sock.sendall(payload)
+                except RETRYABLE_RPC_ERRORS:
+                    if attempt == 0:
+                        time.sleep(0.01)
+                        continue
+                    raise
+                # Replies can span several lines, so read until the server
+                # closes the connection rather than up to the first newline
+                with sock.makefile('rb') as reply:
+                    data = reply.read()
+            break
+        except OSError as e:
+            raise Exception(f"RPC {method} failed: {e}")
+
+    # Try to parse JSON response (straight from bytes, no decode pass)
+    try:
+        return json_loads(data)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        # Don't silently return string - raise error with context
+        raise Exception(
+            f"RPC {method} returned invalid JSON:\n"
+            f"Error: {e}\n"
+            f"Output: {data[:500].decode('utf-8', errors='replace')}"  # First 500 bytes for debugging
+        )
+
+
+def _tail_lines(path, lines, block=8192):
+    """
+    Return the last N lines of a file.
+
+    Reads backwards from the end in blocks until enough newlines have been
+    seen, so only the tail of a large log is ever loaded or decoded.
+    """
+    if lines <= 0:
+        return []
+
+    chunks = []
+    newlines = 0
+    with open(path, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        while pos > 0 and newlines <= lines:
+            size = min(block, pos)
+            pos -= size
+            f.seek(pos)
+            chunk = f.read(size)
+            chunks.append(chunk)
+            newlines += chunk.count(b'\n')
+
+    data = b''.join(reversed(chunks))
+    return data.decode('utf-8', errors='replace').splitlines(keepends=True)[-lines:]
+
+
+class LogTail:
+    """Incrementally reads lines appended to a log file."""
+
+    def __init__(self, path, from_start=False):
+        """
+        Open a log file for tailing.
+
+        Args:
+            path: Path to the log file
+            from_start: If False, only lines written after opening are returned
+        """
+        self._file = open(path, 'rb')
+        if not from_start:
+            self._file.seek(0, os.SEEK_END)
+        self._partial = b''
+
+    def read_lines(self):
+        """Return the complete lines appended since the last call."""
+        data = self._file.read()
+        if not data:
+            return []
+        lines = (self._partial + data).split(b'\n')
+        self._partial = lines.pop()
+        return [line.decode('utf-8', errors='replace') for line in lines]
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
 
 class TestNode:
     """Represents a coinbasechain node for testing."""
@@ -29,6 +173,13 @@ class TestNode:
         self.extra_args = extra_args or []
         self.process = None
         self.rpc_socket = self.datadir / "node.sock"
+        self.log_path = self.datadir / "debug.log"
+        # String forms used on every start and RPC call, built once
+        self._binary_str = str(self.binary_path)
+        self._datadir_arg = f"--datadir={self.datadir}"
+        self._rpc_socket_str = str(self.rpc_socket)
+        self._stdout = None
+        self._stderr = None
 
     def start(self, extra_args=None):
         """Start the node process."""
@@ -40,21 +191,41 @@ class TestNode:
 
         # Build command
         args = [
-            str(self.binary_path),
+            self._binary_str,
             "--regtest",
-            f"--datadir={self.datadir}",
+            self._datadir_arg,
         ]
         args.extend(self.extra_args)
         if extra_args:
             args.extend(extra_args)
 
+        # The node logs at info by default; COINBASE_TEST_LOG_LEVEL and
+        # COINBASE_TEST_DEBUG turn up logging for a whole test run (e.g. when
+        # re-running a failure) without touching arguments the test sets itself
+        log_level = os.environ.get("COINBASE_TEST_LOG_LEVEL")
+        debug_components = os.environ.get("COINBASE_TEST_DEBUG")
+        if log_level or debug_components:
+            # One pass over the arguments for both flags
+            has_loglevel = has_debug = False
+            for a in args:
+                if a.startswith("--loglevel="):
+                    has_loglevel = True
+                elif a.startswith("--debug="):
+                    has_debug = True
+            if log_level and not has_loglevel:
+                args.append(f"--loglevel={log_level}")
+            if debug_components and not has_debug:
+                args.append(f"--debug={debug_components}")
+
         # Start process
-        # Use DEVNULL to avoid blocking on stdout/stderr buffers
+        # Send output to files rather than pipes, which would block the node
+        # once full, so it is still available if the node dies
+        self._stdout = open(self.datadir / "stdout.log", "wb")
+        self._stderr = open(self.datadir / "stderr.log", "wb")
         self.process = subprocess.Popen(
             args,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            text=True
+            stdout=self._stdout,
+            stderr=self._stderr
         )
 
         # Wait for RPC socket to be created
@@ -73,6 +244,23 @@ class TestNode:
             self.process.wait()
 
         self.process = None
+        self._close_output()
+
+    def _close_output(self):
+        for f in (self._stdout, self._stderr):
+            if f:
+                f.close()
+        self._stdout = self._stderr = None
+
+    def read_output(self):
+        """Return the node's captured (stdout, stderr)."""
+        output = []
+        for name in ("stdout.log", "stderr.log"):
+            try:
+                output.append((self.datadir / name).read_text(errors='replace'))
+            except OSError:
+                output.append("")
+        return tuple(output)
 
     def cleanup(self):
         """Clean up node data directory."""
@@ -80,13 +268,20 @@ class TestNode:
             shutil.rmtree(self.datadir)
 
     def wait_for_rpc_connection(self, timeout=30):
-        """Wait for RPC socket to be available and accepting connections."""
+        """
+        Wait for RPC socket to be available and accepting connections.
+
+        Polls with exponential backoff starting at 20 ms, so a node that comes
+        up quickly is noticed almost immediately while a slow one is not
+        hammered with connection attempts.
+        """
         start_time = time.time()
+        interval = 0.02
         while time.time() - start_time < timeout:
             # Check if process crashed
             if not self.is_running():
                 # Process died, read output
-                stdout, stderr = self.process.communicate() if self.process else ("", "")
+                stdout, stderr = self.read_output()
                 log_content = self.read_log() if self.get_log_path().exists() else ""
                 raise Exception(
                     f"Node {self.index} process died during startup.\n"
@@ -101,12 +296,12 @@ class TestNode:
                     self.get_info()
                     # Success! RPC is working
                     return
-                except Exception as e:
-                    # RPC not ready yet, wait a bit
-                    time.sleep(0.5)
-                    continue
+                except Exception:
+                    # RPC not ready yet, retry after the backoff below
+                    pass
 
-            time.sleep(0.1)
+            time.sleep(interval)
+            interval = min(interval * 2, 0.25)
 
         # Timeout - provide debug info
         log_content = self.read_log() if self.get_log_path().exists() else "No log file"
@@ -125,7 +320,7 @@ class TestNode:
 
     def get_log_path(self):
         """Get path to debug.log."""
-        return self.datadir / "debug.log"
+        return self.log_path
 
     def read_log(self, lines=50):
         """Read last N lines from debug.log."""
@@ -133,55 +328,45 @@ class TestNode:
         if not log_path.exists():
             return ""
 
-        with open(log_path, 'r') as f:
-            all_lines = f.readlines()
-            return ''.join(all_lines[-lines:])
+        return ''.join(_tail_lines(log_path, lines))
 
-    def wait_for_log(self, pattern, timeout=10):
-        """Wait for a pattern to appear in the log."""
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            log_content = self.read_log()
-            if pattern in log_content:
-                return True
-            time.sleep(0.5)
-        return False
+    def tail_log(self):
+        """Return a LogTail positioned at the current end of debug.log."""
+        return LogTail(self.get_log_path())
 
-    def rpc(self, method, *params, timeout=30):
+    def wait_for_log(self, pattern, timeout=10):
         """
-        Call RPC method.
+        Wait for a pattern to appear in the log.
 
-        Uses coinbasechain-cli to communicate via Unix socket.
+        The end of the log is checked once so a line written just before the
+        call still counts; after that only newly appended lines are read and
+        scanned, polling with backoff from 10 ms.
         """
-        cli_path = self.binary_path.parent / "coinbasechain-cli"
-
-        args = [
-            str(cli_path),
-            f"--datadir={self.datadir}",
-            method
-        ]
-        args.extend(str(p) for p in params)
-
-        result = subprocess.run(
-            args,
-            capture_output=True,
-            text=True,
-            timeout=timeout
-        )
-
-        if result.returncode != 0:
-            raise Exception(f"RPC {method} failed: {result.stderr}")
+        deadline = time.monotonic() + timeout
+        log_path = self.get_log_path()
+        while not log_path.exists():
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+
+        # Open the tail before checking existing lines so nothing written in
+        # between is missed
+        with LogTail(log_path) as tail:
+            if pattern in self.read_log():
+                return True
+            interval = 0.01
+            while True:
+                if any(pattern in line for line in tail.read_lines()):
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                time.sleep(min(interval, remaining))
+                interval = min(interval * 2, 0.25)
 
-        # Try to parse JSON response
-        try:
-            return json.loads(result.stdout)
-        except json.JSONDecodeError as e:
-            # Don't silently return string - raise error with context
-            raise Exception(
-                f"RPC {method} returned invalid JSON:\n"
-                f"Error: {e}\n"
-                f"Output: {result.stdout[:500]}"  # First 500 chars for debugging
-            )
+    def rpc(self, method, *params, timeout=30):
+        """Call RPC method over the node's Unix socket."""
+        return rpc_call(self._rpc_socket_str, method, *params, timeout=timeout)
 
     def generate(self, nblocks, address=None, timeout=120):
         """Generate blocks with configurable timeout.
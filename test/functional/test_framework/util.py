@@ -1,27 +1,309 @@
 #!/usr/bin/env python3
 """Utility functions for functional tests."""
 
+import functools
+import os
+import shutil
+import subprocess
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
 
-def wait_until(predicate, timeout=10, check_interval=0.5):
+# Repository layout, resolved once at import
+ROOT_DIR = Path(__file__).resolve().parents[3]
+BINARY_PATH = ROOT_DIR / "build" / "bin" / "coinbasechain"
+TEST_DATA_DIR = ROOT_DIR / "test" / "data"
+
+# Linux ioctl that makes dst share src's extents (reflink) on btrfs/XFS
+FICLONE = 0x40049409
+
+# Test directories go on tmpfs when it has room, so node fsyncs and the
+# later cleanup never touch the disk
+SHM_DIR = "/dev/shm"
+SHM_MIN_FREE = 1 << 30
+
+
+RESET = '\033[0m'
+
+
+def log(msg, color=None):
+    """
+    Print a line, optionally colored.
+
+    The line goes out in a single write, so output from worker threads does
+    not interleave.
+    """
+    sys.stdout.write(f"{color}{msg}{RESET}\n" if color else f"{msg}\n")
+
+
+def wait_until(predicate, timeout=10, check_interval=0.25, initial_interval=0.02,
+               backoff=2):
     """
     Wait until a predicate returns True.
 
+    The predicate is checked immediately and then with exponential backoff,
+    starting at initial_interval and growing by backoff up to check_interval,
+    so fast conditions are detected within milliseconds instead of a full
+    poll period.
+
     Args:
         predicate: Callable that returns True when condition is met
         timeout: Maximum time to wait in seconds
-        check_interval: Time between checks in seconds
+        check_interval: Maximum time between checks in seconds
+        initial_interval: Time before the second check in seconds
+        backoff: Factor the interval grows by after each failed check
 
     Returns:
         True if condition met, False if timeout
     """
-    start_time = time.time()
-    while time.time() - start_time < timeout:
+    deadline = time.monotonic() + timeout
+    delay = initial_interval
+    while True:
         if predicate():
             return True
-        time.sleep(check_interval)
-    return False
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay = min(delay * backoff, check_interval)
+
+
+def map_nodes(func, nodes, return_exceptions=False):
+    """
+    Call func(node) for every node concurrently.
+
+    Args:
+        func: Callable taking a single TestNode
+        nodes: Iterable of TestNode instances
+        return_exceptions: If True, exceptions are returned in place of
+            results instead of being raised
+
+    Returns:
+        List of results in the same order as nodes
+    """
+    nodes = list(nodes)
+    if not nodes:
+        return []
+
+    def call(node):
+        try:
+            return func(node)
+        except Exception as e:
+            if return_exceptions:
+                return e
+            raise
+
+    with ThreadPoolExecutor(max_workers=len(nodes)) as executor:
+        return list(executor.map(call, nodes))
+
+
+def multi_rpc(nodes, method, *params, return_exceptions=False):
+    """
+    Issue the same RPC on all nodes in parallel.
+
+    The node's RPC server answers one request per connection, so the calls
+    cannot be batched onto one socket; fanning them out instead makes a
+    multi-node check cost one round-trip rather than one per node.
+
+    Args:
+        nodes: Iterable of TestNode instances
+        method: RPC method name
+        *params: RPC parameters
+        return_exceptions: If True, failed calls yield the exception
+
+    Returns:
+        List of RPC results in the same order as nodes
+    """
+    return map_nodes(lambda node: node.rpc(method, *params), nodes,
+                     return_exceptions=return_exceptions)
+
+
+def multi_get_info(nodes, return_exceptions=False):
+    """
+    Query getinfo on all nodes in parallel.
+
+    Args:
+        nodes: Iterable of TestNode instances
+        return_exceptions: If True, failed queries yield the exception
+
+    Returns:
+        List of getinfo results in the same order as nodes
+    """
+    return multi_rpc(nodes, "getinfo", return_exceptions=return_exceptions)
+
+
+def start_nodes(nodes, *args, **kwargs):
+    """
+    Start several nodes concurrently.
+
+    Each TestNode.start() blocks until its RPC socket answers, so starting
+    them in parallel bounds startup by the slowest node instead of the sum.
+
+    Args:
+        nodes: Iterable of TestNode instances
+        *args, **kwargs: Passed through to TestNode.start()
+    """
+    map_nodes(lambda node: node.start(*args, **kwargs), nodes)
+
+
+def stop_nodes(nodes, timeout=10):
+    """
+    Stop several nodes, waiting for all of them against one deadline.
+
+    SIGTERM goes to every node before any wait starts, so shutdowns overlap
+    and a hung node costs one timeout in total rather than one per node.
+    Nodes still running at the deadline are killed.
+
+    Args:
+        nodes: Iterable of TestNode instances (None entries are skipped)
+        timeout: Seconds to wait for a clean shutdown
+    """
+    nodes = [node for node in nodes if node is not None and node.process]
+    for node in nodes:
+        node.process.terminate()
+
+    deadline = time.monotonic() + timeout
+    for node in nodes:
+        try:
+            node.process.wait(timeout=max(0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            node.process.kill()
+
+    # Reaps killed processes and releases each node's output files
+    for node in nodes:
+        node.stop()
+
+
+def port_base(default=18444):
+    """
+    Return the first P2P port a test should assign to its nodes.
+
+    COINBASE_TEST_PORT_BASE overrides the default so that several tests can
+    run side by side without their nodes colliding on listen ports.
+
+    Args:
+        default: Port used when the variable is unset
+
+    Returns:
+        Base port as an int
+    """
+    return int(os.environ.get("COINBASE_TEST_PORT_BASE", default))
+
+
+def reflink_or_copy(src, dst):
+    """
+    Copy a file, cloning its extents when the filesystem supports it.
+
+    Falls back to shutil.copy2 when reflinks are unavailable. Hardlinks and
+    symlinks are deliberately not used: the node saves headers.json by
+    truncating and rewriting it in place, which would write through a link
+    and corrupt the shared fixture. A reflink gives the same no-data-copy
+    setup without that risk, and without needing the mount privileges an
+    overlayfs would.
+    """
+    if fcntl is not None:
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return dst
+        except OSError:
+            pass
+    return shutil.copy2(src, dst)
+
+
+@functools.lru_cache(maxsize=None)
+def chain_fixture(name):
+    """
+    Locate a chain fixture under test/data, checking it exists only once.
+
+    Args:
+        name: Fixture directory name (e.g. "chain_5")
+
+    Returns:
+        Path to the fixture directory
+    """
+    path = TEST_DATA_DIR / name
+    if not path.is_dir():
+        raise FileNotFoundError(f"Chain fixture not found: {path}")
+    return path
+
+
+def copy_chain_fixtures(copies):
+    """
+    Copy several chain fixtures into node datadirs concurrently.
+
+    Fixtures are copied recursively, file by file through reflink_or_copy.
+
+    Args:
+        copies: Iterable of (fixture name, destination directory) pairs
+
+    Returns:
+        List of destination paths
+    """
+    copies = list(copies)
+    if not copies:
+        return []
+
+    def copy(pair):
+        name, dst = pair
+        dst = Path(dst)
+        shutil.copytree(chain_fixture(name), dst,
+                        copy_function=reflink_or_copy, dirs_exist_ok=True)
+        return dst
+
+    with ThreadPoolExecutor(max_workers=len(copies)) as executor:
+        return list(executor.map(copy, copies))
+
+
+def scratch_root():
+    """
+    Pick the directory test directories should be created in.
+
+    An explicit TMPDIR wins (test_runner sets one per test); otherwise
+    /dev/shm is used when more than 1 GiB is free there.
+
+    Returns:
+        Directory path, or None for the default temp directory
+    """
+    if os.environ.get("TMPDIR"):
+        return None
+    try:
+        return SHM_DIR if shutil.disk_usage(SHM_DIR).free > SHM_MIN_FREE else None
+    except OSError:
+        return None
+
+
+def remove_test_dir(test_dir):
+    """
+    Delete a test directory without waiting for the deletion to finish.
+
+    Chain datadirs can hold thousands of files, so the tree is handed to a
+    detached ``rm -rf`` that outlives the test process, and the test exits
+    without waiting for it. Falls back to a blocking shutil.rmtree when rm is
+    unavailable. Set CBC_KEEP_TEST_DIR to keep the directory for debugging.
+
+    Args:
+        test_dir: Directory to remove
+    """
+    if os.environ.get("CBC_KEEP_TEST_DIR"):
+        print(f"Keeping test directory: {test_dir}")
+        return
+    try:
+        # Own session, so a Ctrl-C aimed at the test does not stop the delete
+        subprocess.Popen(["rm", "-rf", str(test_dir)],
+                         stdin=subprocess.DEVNULL,
+                         stdout=subprocess.DEVNULL,
+                         stderr=subprocess.DEVNULL,
+                         start_new_session=True)
+    except OSError:
+        shutil.rmtree(test_dir, ignore_errors=True)
 
 
 def connect_nodes(node_from, node_to):
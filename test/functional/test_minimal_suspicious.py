@@ -3,7 +3,6 @@
 
 import sys
 import tempfile
-import shutil
 import time
 from pathlib import Path
 
@@ -11,6 +10,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent / "test_framework"))
 
 from test_node import TestNode
+from util import remove_test_dir, port_base, BINARY_PATH
 
 
 def main():
@@ -19,7 +19,8 @@ def main():
 
     # Setup test directory
     test_dir = Path(tempfile.mkdtemp(prefix="coinbasechain_minimal_"))
-    binary_path = Path(__file__).parent.parent.parent / "build" / "bin" / "coinbasechain"
+    binary_path = BINARY_PATH
+    BASE_PORT = port_base(19000)
 
     node0 = None
 
@@ -27,7 +28,7 @@ def main():
         # Start ONE node with suspiciousreorgdepth flag
         print("Starting node0 with --suspiciousreorgdepth=5...")
         node0 = TestNode(0, test_dir / "node0", binary_path,
-                        extra_args=["--listen", "--port=19000", "--suspiciousreorgdepth=5"])
+                        extra_args=["--listen", f"--port={BASE_PORT}", "--suspiciousreorgdepth=5"])
 
         print("Calling node0.start()...")
         node0.start()
@@ -58,7 +59,7 @@ def main():
             node0.stop()
 
         print(f"\nCleaning up test directory: {test_dir}")
-        shutil.rmtree(test_dir, ignore_errors=True)
+        remove_test_dir(test_dir)
 
 
 if __name__ == "__main__":
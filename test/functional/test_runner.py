@@ -1,58 +1,108 @@
 #!/usr/bin/env python3
 """Test runner for functional tests."""
 
+import argparse
 import sys
 import os
+import shutil
 import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-
-def run_test(test_script):
-    """Run a single test script."""
-    print(f"\n{'=' * 60}")
-    print(f"Running: {test_script.name}")
-    print('=' * 60)
-
-    result = subprocess.run(
-        [sys.executable, str(test_script)],
-        cwd=test_script.parent.parent.parent
-    )
-
-    return result.returncode == 0
+sys.path.insert(0, str(Path(__file__).parent / "test_framework"))
+from util import scratch_root
+
+# Each test gets its own block of P2P ports via COINBASE_TEST_PORT_BASE so
+# tests running side by side never bind the same port
+PORT_BASE = 20000
+PORTS_PER_TEST = 100
+
+# Files to exclude (setup scripts, debug scripts, and infrastructure)
+EXCLUDE = frozenset({
+    "test_runner.py",
+    "generate_test_chain.py",    # Setup script, not a test
+    "generate_test_chains.py",   # Setup script, not a test
+    "regenerate_test_chains.py", # Setup script, not a test
+    "debug_sync_issue.py",       # Debug script, not a test
+})
+
+
+def run_test(test_script, port_base):
+    """
+    Run a single test script.
+
+    Output is captured and returned rather than streamed, so the output of
+    tests running in parallel does not interleave. The test gets its own
+    TMPDIR, which is removed once it exits, so nothing a test leaves behind
+    (including trees its background deletes have not finished) outlives the
+    run.
+
+    Returns:
+        Tuple of (success, combined stdout/stderr)
+    """
+    tmp_root = tempfile.mkdtemp(prefix="cbc_run_", dir=scratch_root())
+    env = {**os.environ, "COINBASE_TEST_PORT_BASE": str(port_base),
+           "TMPDIR": tmp_root}
+    try:
+        result = subprocess.run(
+            [sys.executable, str(test_script)],
+            cwd=test_script.parent.parent.parent,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="replace"
+        )
+    finally:
+        if not os.environ.get("CBC_KEEP_TEST_DIR"):
+            shutil.rmtree(tmp_root, ignore_errors=True)
+
+    return result.returncode == 0, result.stdout
 
 
 def main():
     """Run all functional tests."""
-    test_dir = Path(__file__).parent
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Number of tests to run in parallel (default: CPU count)")
+    args = parser.parse_args()
 
-    # Files to exclude (setup scripts, debug scripts, and infrastructure)
-    exclude_files = {
-        "test_runner.py",
-        "generate_test_chain.py",    # Setup script, not a test
-        "generate_test_chains.py",   # Setup script, not a test
-        "regenerate_test_chains.py", # Setup script, not a test
-        "debug_sync_issue.py",       # Debug script, not a test
-    }
+    test_dir = Path(__file__).parent
 
     # Find all test scripts (only feature_* and test_* files)
-    test_scripts = []
-    for file in sorted(test_dir.glob("*.py")):
-        if file.name not in exclude_files and not file.name.startswith("_"):
-            # Only include files that start with "feature_" or "test_"
-            if file.name.startswith("feature_") or file.name.startswith("test_"):
-                test_scripts.append(file)
+    with os.scandir(test_dir) as entries:
+        test_scripts = sorted(
+            Path(entry.path) for entry in entries
+            if entry.name.endswith(".py")
+            and entry.name.startswith(("feature_", "test_"))
+            and entry.name not in EXCLUDE
+            and entry.is_file()
+        )
 
     if not test_scripts:
         print("No test scripts found!")
         return 1
 
-    print(f"Found {len(test_scripts)} test(s)")
+    jobs = max(1, min(args.jobs, len(test_scripts)))
+    print(f"Found {len(test_scripts)} test(s), running {jobs} at a time")
 
     # Run all tests
     results = {}
-    for test_script in test_scripts:
-        success = run_test(test_script)
-        results[test_script.name] = success
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(run_test, test_script, PORT_BASE + i * PORTS_PER_TEST): test_script
+            for i, test_script in enumerate(test_scripts)
+        }
+        for future in as_completed(futures):
+            test_script = futures[future]
+            success, output = future.result()
+            results[test_script.name] = success
+
+            print(f"\n{'=' * 60}")
+            print(f"{'✓' if success else '✗'} {test_script.name}")
+            print('=' * 60)
+            print(output, end="")
 
     # Print summary
     print(f"\n{'=' * 60}")
@@ -62,8 +112,8 @@ def main():
     passed = sum(1 for success in results.values() if success)
     failed = len(results) - passed
 
-    for test_name, success in results.items():
-        status = "✓ PASSED" if success else "✗ FAILED"
+    for test_name in sorted(results):
+        status = "✓ PASSED" if results[test_name] else "✗ FAILED"
         print(f"{status}: {test_name}")
 
     print(f"\n{passed} passed, {failed} failed out of {len(results)} tests")
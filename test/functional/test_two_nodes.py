@@ -2,8 +2,6 @@
 """Test starting two nodes with different suspiciousreorgdepth settings."""
 
 import sys
-import tempfile
-import shutil
 import time
 from pathlib import Path
 
@@ -11,6 +9,8 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent / "test_framework"))
 
 from test_node import TestNode
+from harness import make_test_dir, stop_and_cleanup
+from util import port_base, BINARY_PATH
 
 
 def main():
@@ -18,8 +18,9 @@ def main():
     print("\n=== Two Node Test ===\n")
 
     # Setup test directory
-    test_dir = Path(tempfile.mkdtemp(prefix="coinbasechain_two_nodes_"))
-    binary_path = Path(__file__).parent.parent.parent / "build" / "bin" / "coinbasechain"
+    test_dir = make_test_dir("coinbasechain_two_nodes_")
+    binary_path = BINARY_PATH
+    BASE_PORT = port_base(19000)
 
     node0 = None
     node1 = None
@@ -28,7 +29,7 @@ def main():
         # Start node0 with default limit (100)
         print("Starting node0 (default suspiciousreorgdepth=100)...")
         node0 = TestNode(0, test_dir / "node0", binary_path,
-                        extra_args=["--listen", "--port=19000"])
+                        extra_args=["--listen", f"--port={BASE_PORT}"])
 
         print("Calling node0.start()...")
         node0.start()
@@ -37,7 +38,7 @@ def main():
         # Start node1 with custom limit (5)
         print("\nStarting node1 (suspiciousreorgdepth=5)...")
         node1 = TestNode(1, test_dir / "node1", binary_path,
-                        extra_args=["--listen", "--port=19001", "--suspiciousreorgdepth=5"])
+                        extra_args=["--listen", f"--port={BASE_PORT + 1}", "--suspiciousreorgdepth=5"])
 
         print("Calling node1.start()...")
         node1.start()
@@ -70,13 +71,7 @@ def main():
 
     finally:
         # Cleanup
-        if node0 and node0.is_running():
-            node0.stop()
-        if node1 and node1.is_running():
-            node1.stop()
-
-        print(f"\nCleaning up test directory: {test_dir}")
-        shutil.rmtree(test_dir, ignore_errors=True)
+        stop_and_cleanup([node0, node1], test_dir)
 
 
 if __name__ == "__main__":
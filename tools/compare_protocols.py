@@ -5,10 +5,9 @@ Compares CoinbaseChain protocol with Bitcoin protocol
 """
 
 import struct
-import hashlib
-import socket
-import time
-from typing import Dict, Any, Tuple, Optional
+import sys
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Tuple
 
 # Protocol constants
 BITCOIN_MAGIC = 0xD9B4BEF9
@@ -19,257 +18,274 @@ COINBASE_MAGIC = 0x554E4943  # "UNIC"
 COINBASE_PORT = 9590
 COINBASE_VERSION = 1
 
+# Message header: magic, command, payload length, checksum
+_MESSAGE_HEADER = struct.Struct('<I12sI4s')
+_PING_CMD = b'ping\x00\x00\x00\x00\x00\x00\x00\x00'
+
+# Ping headers used as test vectors (8-byte payload, checksum placeholder)
+_BTC_PING_HEADER = _MESSAGE_HEADER.pack(BITCOIN_MAGIC, _PING_CMD, 8, b'\x00\x00\x00\x00')
+_CBC_PING_HEADER = _MESSAGE_HEADER.pack(COINBASE_MAGIC, _PING_CMD, 8, b'\x00\x00\x00\x00')
+
+# Report text for the test vectors above
+_TEST_VECTORS_TEXT = "\n".join((
+    f"Bitcoin header:     {_BTC_PING_HEADER.hex()[:32]}...",
+    f"CoinbaseChain header: {_CBC_PING_HEADER.hex()[:32]}...",
+    f"First 4 bytes (magic) differ: {_BTC_PING_HEADER[:4].hex()} vs {_CBC_PING_HEADER[:4].hex()}",
+    f"Rest of structure identical: {_BTC_PING_HEADER[4:] == _CBC_PING_HEADER[4:]}",
+))
+
+# Comparison tables. Everything in them is derived from the constants above,
+# so they are built once at import time and frozen so callers cannot mutate
+# the shared copies.
+_HEADER_LAYOUT = MappingProxyType({
+    'size': 24,
+    'magic': '4 bytes',
+    'command': '12 bytes (null-padded)',
+    'length': '4 bytes (little-endian)',
+    'checksum': '4 bytes (SHA256(SHA256(payload))[:4])'
+})
+
+_MESSAGE_HEADER_CMP = MappingProxyType({
+    'bitcoin': _HEADER_LAYOUT,
+    'coinbasechain': _HEADER_LAYOUT,
+    'compatible': True,
+    'note': 'Identical structure, different magic bytes'
+})
+
+_BLOCK_HEADER_CMP = MappingProxyType({
+    'bitcoin': MappingProxyType({
+        'size': 80,
+        'fields': (
+            ('nVersion', 4),
+            ('hashPrevBlock', 32),
+            ('hashMerkleRoot', 32),
+            ('nTime', 4),
+            ('nBits', 4),
+            ('nNonce', 4)
+        )
+    }),
+    'coinbasechain': MappingProxyType({
+        'size': 100,
+        'fields': (
+            ('nVersion', 4),
+            ('hashPrevBlock', 32),
+            ('minerAddress', 20),  # Replaces merkleRoot
+            ('nTime', 4),
+            ('nBits', 4),
+            ('nNonce', 4),
+            ('hashRandomX', 20)  # Additional field
+        )
+    }),
+    'compatible': False,
+    'note': 'Different size and fields - intentional for headers-only design'
+})
+
+_VERSION_CMP = MappingProxyType({
+    'fields': MappingProxyType({
+        'version': 'Both have (different values)',
+        'services': 'Both have (different meanings)',
+        'timestamp': 'Both have (same format)',
+        'addr_recv': 'Both have (same format)',
+        'addr_from': 'Both have (both send empty)',
+        'nonce': 'Both have (same purpose)',
+        'user_agent': 'Both have (different values)',
+        'start_height': 'Both have (same purpose)',
+        'relay': 'Bitcoin only (optional)'
+    }),
+    'bitcoin_version': BITCOIN_VERSION,
+    'coinbase_version': COINBASE_VERSION,
+    'compatible': 'Structurally yes, semantically no'
+})
+
+
+def _frozen_table(rows: Dict[str, Dict[str, Any]]) -> MappingProxyType:
+    """Freeze a table of comparison rows, including each row."""
+    return MappingProxyType({name: MappingProxyType(row) for name, row in rows.items()})
+
+
+_NETWORK_PARAMS = MappingProxyType({
+    'parameter': _frozen_table({
+        'Magic Bytes': {
+            'bitcoin': hex(BITCOIN_MAGIC),
+            'coinbasechain': hex(COINBASE_MAGIC),
+            'match': False
+        },
+        'Default Port': {
+            'bitcoin': BITCOIN_PORT,
+            'coinbasechain': COINBASE_PORT,
+            'match': False
+        },
+        'Protocol Version': {
+            'bitcoin': f'{BITCOIN_VERSION}+',
+            'coinbasechain': COINBASE_VERSION,
+            'match': False
+        },
+        'Block Time': {
+            'bitcoin': '600 seconds',
+            'coinbasechain': '120 seconds',
+            'match': False
+        },
+        'PoW Algorithm': {
+            'bitcoin': 'SHA256d',
+            'coinbasechain': 'RandomX',
+            'match': False
+        }
+    })
+})
+
+_CONSENSUS_RULES = MappingProxyType({
+    'rules': _frozen_table({
+        'Time > MTP': {
+            'bitcoin': 'Yes',
+            'coinbasechain': 'Yes',
+            'match': True
+        },
+        'Future Time Limit': {
+            'bitcoin': '2 hours',
+            'coinbasechain': '2 hours',
+            'match': True
+        },
+        'Difficulty Adjustment': {
+            'bitcoin': 'Every 2016 blocks',
+            'coinbasechain': 'Every block (ASERT)',
+            'match': False
+        },
+        'Checkpoints': {
+            'bitcoin': 'Yes',
+            'coinbasechain': 'No',
+            'match': False
+        },
+        'Soft Fork Signals': {
+            'bitcoin': 'BIP9',
+            'coinbasechain': 'None',
+            'match': False
+        }
+    })
+})
+
+
+def _render_table(rows: Mapping[str, Mapping[str, Any]]) -> str:
+    """Render comparison rows as aligned BTC | CBC text lines."""
+    row = "{:20} BTC: {:>15} | CBC: {:>15} {}".format
+    return "\n".join(row(name, values['bitcoin'], values['coinbasechain'],
+                          "✅" if values['match'] else "❌")
+                      for name, values in rows.items())
+
+
+# The tables are static, so their report text is too
+_NETWORK_PARAMS_TEXT = _render_table(_NETWORK_PARAMS['parameter'])
+_CONSENSUS_RULES_TEXT = _render_table(_CONSENSUS_RULES['rules'])
+
+# Protocol areas counted towards the compatibility score
+_COMPAT_CHECKS = (
+    ('Message Header', True),   # Same structure
+    ('Block Header', False),    # Different
+    ('Serialization', True),     # Same methods
+    ('Network Magic', False),    # Different
+    ('Port', False),            # Different
+    ('Time Rules', True),       # Same
+    ('Version Message', True),   # Same structure
+    ('Checksum', True),         # Same algorithm
+    ('Network Address', True),   # Same format
+    ('PoW', False),            # Different algorithm
+    ('Block Time', False),      # Different
+    ('Difficulty', False),      # Different algorithm
+)
+
+_COMPAT_SCORE = (sum(1 for _, compatible in _COMPAT_CHECKS if compatible)
+                 / len(_COMPAT_CHECKS)) * 100
+
 class ProtocolComparator:
     """Compare Bitcoin and CoinbaseChain protocols"""
 
-    def __init__(self):
-        self.differences = []
-        self.similarities = []
+    # Stateless: every comparison is a module-level constant
+    __slots__ = ()
 
-    def compare_message_header(self) -> Dict[str, Any]:
+    def compare_message_header(self) -> Mapping[str, Any]:
         """Compare message header structures"""
-        results = {
-            'bitcoin': {
-                'size': 24,
-                'magic': '4 bytes',
-                'command': '12 bytes (null-padded)',
-                'length': '4 bytes (little-endian)',
-                'checksum': '4 bytes (SHA256(SHA256(payload))[:4])'
-            },
-            'coinbasechain': {
-                'size': 24,
-                'magic': '4 bytes',
-                'command': '12 bytes (null-padded)',
-                'length': '4 bytes (little-endian)',
-                'checksum': '4 bytes (SHA256(SHA256(payload))[:4])'
-            },
-            'compatible': True,
-            'note': 'Identical structure, different magic bytes'
-        }
-        return results
+        return _MESSAGE_HEADER_CMP
 
-    def compare_block_header(self) -> Dict[str, Any]:
+    def compare_block_header(self) -> Mapping[str, Any]:
         """Compare block header structures"""
-        results = {
-            'bitcoin': {
-                'size': 80,
-                'fields': [
-                    ('nVersion', 4),
-                    ('hashPrevBlock', 32),
-                    ('hashMerkleRoot', 32),
-                    ('nTime', 4),
-                    ('nBits', 4),
-                    ('nNonce', 4)
-                ]
-            },
-            'coinbasechain': {
-                'size': 100,
-                'fields': [
-                    ('nVersion', 4),
-                    ('hashPrevBlock', 32),
-                    ('minerAddress', 20),  # Replaces merkleRoot
-                    ('nTime', 4),
-                    ('nBits', 4),
-                    ('nNonce', 4),
-                    ('hashRandomX', 20)  # Additional field
-                ]
-            },
-            'compatible': False,
-            'note': 'Different size and fields - intentional for headers-only design'
-        }
-        return results
+        return _BLOCK_HEADER_CMP
 
-    def compare_version_message(self) -> Dict[str, Any]:
+    def compare_version_message(self) -> Mapping[str, Any]:
         """Compare VERSION message format"""
-        results = {
-            'fields': {
-                'version': 'Both have (different values)',
-                'services': 'Both have (different meanings)',
-                'timestamp': 'Both have (same format)',
-                'addr_recv': 'Both have (same format)',
-                'addr_from': 'Both have (both send empty)',
-                'nonce': 'Both have (same purpose)',
-                'user_agent': 'Both have (different values)',
-                'start_height': 'Both have (same purpose)',
-                'relay': 'Bitcoin only (optional)'
-            },
-            'bitcoin_version': BITCOIN_VERSION,
-            'coinbase_version': COINBASE_VERSION,
-            'compatible': 'Structurally yes, semantically no'
-        }
-        return results
+        return _VERSION_CMP
 
-    def compare_network_params(self) -> Dict[str, Any]:
+    def compare_network_params(self) -> Mapping[str, Any]:
         """Compare network parameters"""
-        results = {
-            'parameter': {
-                'Magic Bytes': {
-                    'bitcoin': hex(BITCOIN_MAGIC),
-                    'coinbasechain': hex(COINBASE_MAGIC),
-                    'match': False
-                },
-                'Default Port': {
-                    'bitcoin': BITCOIN_PORT,
-                    'coinbasechain': COINBASE_PORT,
-                    'match': False
-                },
-                'Protocol Version': {
-                    'bitcoin': f'{BITCOIN_VERSION}+',
-                    'coinbasechain': COINBASE_VERSION,
-                    'match': False
-                },
-                'Block Time': {
-                    'bitcoin': '600 seconds',
-                    'coinbasechain': '120 seconds',
-                    'match': False
-                },
-                'PoW Algorithm': {
-                    'bitcoin': 'SHA256d',
-                    'coinbasechain': 'RandomX',
-                    'match': False
-                }
-            }
-        }
-        return results
+        return _NETWORK_PARAMS
 
-    def compare_consensus_rules(self) -> Dict[str, Any]:
+    def compare_consensus_rules(self) -> Mapping[str, Any]:
         """Compare consensus rules"""
-        results = {
-            'rules': {
-                'Time > MTP': {
-                    'bitcoin': 'Yes',
-                    'coinbasechain': 'Yes',
-                    'match': True
-                },
-                'Future Time Limit': {
-                    'bitcoin': '2 hours',
-                    'coinbasechain': '2 hours',
-                    'match': True
-                },
-                'Difficulty Adjustment': {
-                    'bitcoin': 'Every 2016 blocks',
-                    'coinbasechain': 'Every block (ASERT)',
-                    'match': False
-                },
-                'Checkpoints': {
-                    'bitcoin': 'Yes',
-                    'coinbasechain': 'No',
-                    'match': False
-                },
-                'Soft Fork Signals': {
-                    'bitcoin': 'BIP9',
-                    'coinbasechain': 'None',
-                    'match': False
-                }
-            }
-        }
-        return results
+        return _CONSENSUS_RULES
 
     def calculate_compatibility_score(self) -> float:
         """Calculate overall protocol compatibility percentage"""
-        checks = [
-            ('Message Header', True),   # Same structure
-            ('Block Header', False),    # Different
-            ('Serialization', True),     # Same methods
-            ('Network Magic', False),    # Different
-            ('Port', False),            # Different
-            ('Time Rules', True),       # Same
-            ('Version Message', True),   # Same structure
-            ('Checksum', True),         # Same algorithm
-            ('Network Address', True),   # Same format
-            ('PoW', False),            # Different algorithm
-            ('Block Time', False),      # Different
-            ('Difficulty', False),      # Different algorithm
-        ]
-
-        matches = sum(1 for _, compatible in checks if compatible)
-        total = len(checks)
-
-        return (matches / total) * 100
+        return _COMPAT_SCORE
 
     def generate_test_vector(self, msg_type: str) -> Tuple[bytes, bytes]:
         """Generate test vectors for both protocols"""
         if msg_type == 'header':
-            # Bitcoin message header (ping)
-            btc_header = struct.pack('<I12sI4s',
-                BITCOIN_MAGIC,
-                b'ping\x00\x00\x00\x00\x00\x00\x00\x00',
-                8,  # payload length
-                b'\x00\x00\x00\x00'  # checksum placeholder
-            )
-
-            # CoinbaseChain message header (ping)
-            our_header = struct.pack('<I12sI4s',
-                COINBASE_MAGIC,
-                b'ping\x00\x00\x00\x00\x00\x00\x00\x00',
-                8,  # payload length
-                b'\x00\x00\x00\x00'  # checksum placeholder
-            )
-
-            return btc_header, our_header
+            return _BTC_PING_HEADER, _CBC_PING_HEADER
 
         return b'', b''
 
     def run_full_comparison(self) -> None:
         """Run complete protocol comparison"""
-        print("=" * 60)
-        print("PROTOCOL COMPARISON: Bitcoin vs CoinbaseChain")
-        print("=" * 60)
+        # Collect the report and write it out in one go
+        out = []
+        add = out.append
+
+        add("=" * 60)
+        add("PROTOCOL COMPARISON: Bitcoin vs CoinbaseChain")
+        add("=" * 60)
 
         # Message header comparison
-        print("\n1. MESSAGE HEADER STRUCTURE")
-        print("-" * 40)
+        add("\n1. MESSAGE HEADER STRUCTURE")
+        add("-" * 40)
         header_comp = self.compare_message_header()
-        print(f"Compatible: {header_comp['compatible']}")
-        print(f"Note: {header_comp['note']}")
+        add(f"Compatible: {header_comp['compatible']}")
+        add(f"Note: {header_comp['note']}")
 
         # Block header comparison
-        print("\n2. BLOCK HEADER STRUCTURE")
-        print("-" * 40)
+        add("\n2. BLOCK HEADER STRUCTURE")
+        add("-" * 40)
         block_comp = self.compare_block_header()
-        print(f"Bitcoin: {block_comp['bitcoin']['size']} bytes")
-        print(f"CoinbaseChain: {block_comp['coinbasechain']['size']} bytes")
-        print(f"Compatible: {block_comp['compatible']}")
+        add(f"Bitcoin: {block_comp['bitcoin']['size']} bytes")
+        add(f"CoinbaseChain: {block_comp['coinbasechain']['size']} bytes")
+        add(f"Compatible: {block_comp['compatible']}")
 
         # Network parameters
-        print("\n3. NETWORK PARAMETERS")
-        print("-" * 40)
-        net_params = self.compare_network_params()
-        for param, values in net_params['parameter'].items():
-            match_str = "✅" if values['match'] else "❌"
-            print(f"{param:20} BTC: {values['bitcoin']:>15} | "
-                  f"CBC: {values['coinbasechain']:>15} {match_str}")
+        add("\n3. NETWORK PARAMETERS")
+        add("-" * 40)
+        add(_NETWORK_PARAMS_TEXT)
 
         # Consensus rules
-        print("\n4. CONSENSUS RULES")
-        print("-" * 40)
-        consensus = self.compare_consensus_rules()
-        for rule, values in consensus['rules'].items():
-            match_str = "✅" if values['match'] else "❌"
-            print(f"{rule:20} BTC: {values['bitcoin']:>15} | "
-                  f"CBC: {values['coinbasechain']:>15} {match_str}")
+        add("\n4. CONSENSUS RULES")
+        add("-" * 40)
+        add(_CONSENSUS_RULES_TEXT)
 
         # Overall compatibility
-        print("\n5. OVERALL COMPATIBILITY")
-        print("-" * 40)
+        add("\n5. OVERALL COMPATIBILITY")
+        add("-" * 40)
         score = self.calculate_compatibility_score()
-        print(f"Protocol Compatibility Score: {score:.1f}%")
+        add(f"Protocol Compatibility Score: {score:.1f}%")
 
         if score > 80:
-            print("Assessment: High structural compatibility")
+            add("Assessment: High structural compatibility")
         elif score > 50:
-            print("Assessment: Moderate compatibility")
+            add("Assessment: Moderate compatibility")
         else:
-            print("Assessment: Low compatibility (intentionally separate)")
+            add("Assessment: Low compatibility (intentionally separate)")
 
         # Test vectors
-        print("\n6. TEST VECTORS")
-        print("-" * 40)
-        btc_hdr, our_hdr = self.generate_test_vector('header')
-        print(f"Bitcoin header:     {btc_hdr.hex()[:32]}...")
-        print(f"CoinbaseChain header: {our_hdr.hex()[:32]}...")
-        print(f"First 4 bytes (magic) differ: {btc_hdr[:4].hex()} vs {our_hdr[:4].hex()}")
-        print(f"Rest of structure identical: {btc_hdr[4:] == our_hdr[4:]}")
+        add("\n6. TEST VECTORS")
+        add("-" * 40)
+        add(_TEST_VECTORS_TEXT)
+
+        sys.stdout.write("\n".join(out) + "\n")
 
 def main():
     """Run protocol comparison"""